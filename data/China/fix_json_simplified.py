@@ -1,8 +1,10 @@
 import json
 import os
-from opencc import OpenCC
+import sys
 
-cc = OpenCC('t2s')
+# Add project root to path to import the shared converter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.chinese_convert import to_simplified_many
 
 def fix_json():
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,9 +20,9 @@ def fix_json():
     print(f"Processing {len(universities)} universities...")
     
     changed_count = 0
-    for i, uni in enumerate(universities):
+    simplified_names = to_simplified_many(uni['chinese_name'] for uni in universities)
+    for uni, simplified_name in zip(universities, simplified_names):
         original_name = uni['chinese_name']
-        simplified_name = cc.convert(original_name)
         if original_name != simplified_name:
             uni['chinese_name'] = simplified_name
             changed_count += 1
@@ -1,20 +1,21 @@
-import requests
 from bs4 import BeautifulSoup
+import argparse
 import json
 import os
+import sys
 
-def get_province_links():
+# Add project root to path to import the shared Wikipedia scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.wiki_scraper import WikiScraper, add_scraper_arguments
+
+def get_province_links(scraper=None):
     url = "https://en.wikipedia.org/wiki/List_of_universities_and_colleges_in_China"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        print(f"Failed to fetch page: {response.status_code}")
+    scraper = scraper or WikiScraper()
+    html = scraper.fetch(url)
+    if not html:
         return
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(html, 'html.parser')
     
     province_links = []
     
@@ -66,7 +67,7 @@ def get_province_links():
         final_list = unique_links
         
     # Save to a file for reference
-    output_path = os.path.join('China', 'province_links.json')
+    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'province_links.json')
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(final_list, f, ensure_ascii=False, indent=4)
         
@@ -75,4 +76,6 @@ def get_province_links():
         print(link)
 
 if __name__ == "__main__":
-    get_province_links()
+    parser = argparse.ArgumentParser()
+    add_scraper_arguments(parser)
+    get_province_links(WikiScraper.from_args(parser.parse_args()))
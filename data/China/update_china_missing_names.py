@@ -1,12 +1,27 @@
-import json
-import csv
 import os
 import sys
 import pandas as pd
 
-# Add root to path to import gemini_translator
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from gemini_translator import GeminiTranslator
+# Add project root to path to import the translator and the checkpoint journal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from main import make_translator, pack_batches
+from scripts.checkpoint_journal import CheckpointJournal, atomic_file
+from scripts.missing_names import MissingNameTable
+from scripts.text_normalize import clean_name
+
+# Streamed translations are logged in groups of this many names
+CHECKPOINT_EVERY = 20
+
+def save_csv(df, csv_path):
+    # Temp file + rename, so an interrupted save never leaves a truncated CSV
+    with atomic_file(csv_path, encoding='utf-8-sig', newline='') as f:
+        df.to_csv(f, index=False)
+
+def checkpoint(table, journal, results, csv_path):
+    # Update the main table and log the names; the CSV is rewritten only now and then
+    table.update(results)
+    if journal.append(results, len(table.df)):
+        journal.compact(lambda: save_csv(table.frame(), csv_path))
 
 def main():
     csv_path = os.path.join(os.path.dirname(__file__), "china_universities.csv")
@@ -17,51 +32,55 @@ def main():
 
     print(f"Reading {csv_path}...")
     df = pd.read_csv(csv_path, encoding='utf-8-sig')
+
+    # Indexed on chinese_name: each batch is written back in one lookup,
+    # and the missing count is kept up to date from the rows it touched
+    table = MissingNameTable(df)
+
+    # Batches translated since the last save of an interrupted run
+    journal = CheckpointJournal(csv_path + '.wal')
+    replayed = journal.replay()
+    table.update(replayed)
+    if replayed:
+        print(f"Recovered {len(replayed)} translations from {journal.path}")
     
     # Identify missing names
-    missing_mask = df['english_name'].isna() | (df['english_name'].astype(str).str.strip() == "") | (df['english_name'].astype(str).str.lower() == "nan")
-    to_translate_df = df[missing_mask]
+    to_translate = table.missing_keys()
     
-    if to_translate_df.empty:
+    if not to_translate:
+        if replayed:
+            journal.compact(lambda: save_csv(table.frame(), csv_path))
         print("No missing English names found in China university list.")
         return
 
-    print(f"Found {len(to_translate_df)} universities with missing English names. Translating via Gemini...")
+    print(f"Found {len(to_translate)} universities with missing English names. Translating...")
     
-    translator = GeminiTranslator()
-    batch_size = 50
+    translator = make_translator()
     
     # Prepare data for translator
     # We pass chinese_name as both to emphasize it's the source
-    raw_data = [
-        {"chinese_name": row['chinese_name'], "original_name": row['chinese_name']}
-        for _, row in to_translate_df.iterrows()
-    ]
+    raw_data = [{"chinese_name": cname, "original_name": cname} for cname in to_translate]
 
-    for i in range(0, len(raw_data), batch_size):
-        batch = raw_data[i:i+batch_size]
-        print(f"Processing batch {i//batch_size + 1}/{(len(raw_data)-1)//batch_size + 1}...")
-        
-        # Using country="China" and language="Chinese"
-        translated_batch = translator.translate_university_names(batch, country="China", language="Chinese")
+    # Requests are filled up to a token budget rather than a fixed count
+    batches = pack_batches(raw_data, "China", "Chinese")
+    for n, batch in enumerate(batches, 1):
+        print(f"Processing batch {n}/{len(batches)} ({len(batch)} names)...")
         
-        # Update the main dataframe
-        for item in translated_batch:
-            cname = item.get('chinese_name')
-            ename = str(item.get('english_name', '')).strip()
-            
-            # Clean wrapping quotes and internal quotes
-            if ename.startswith('"') and ename.endswith('"'):
-                ename = ename[1:-1].strip()
-            ename = ename.replace('"', "'").replace(',', ' ')
-            
+        # Using country="China" and language="Chinese". Names are applied as
+        # the reply streams in and checkpointed every few names, so an
+        # interrupted batch keeps what already arrived
+        pending = {}
+        for item in translator.stream_university_names(batch, country="China", language="Chinese"):
+            ename = clean_name(item.get('english_name', ''))
             if ename:
-                df.loc[df['chinese_name'] == cname, 'english_name'] = ename
-        
-        # Save after each batch
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        print(f"Batch saved. Remaining missing: {len(df[df['english_name'].isna() | (df['english_name'].astype(str).str.strip() == '')])}")
+                pending[item['chinese_name']] = ename
+            if len(pending) >= CHECKPOINT_EVERY:
+                checkpoint(table, journal, pending, csv_path)
+                pending = {}
+        checkpoint(table, journal, pending, csv_path)
+        print(f"Batch checkpointed. Remaining missing: {table.missing}")
 
+    journal.compact(lambda: save_csv(table.frame(), csv_path))
     print(f"Successfully finished updating missing names in {csv_path}")
 
 if __name__ == "__main__":
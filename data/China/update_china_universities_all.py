@@ -1,9 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import csv
 import json
 import os
 import re
-import time
+import sys
+
+# Add project root to path to import the shared Wikipedia scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.wiki_scraper import WikiScraper, add_scraper_arguments
+from scripts.chinese_convert import to_simplified_many
+from scripts.wikitable import iter_name_rows
+from scripts.text_normalize import normalize
 
 def clean_text(text):
     if not text:
@@ -12,117 +19,73 @@ def clean_text(text):
     text = re.sub(r'\[[a-z]{2}\]', '', text)
     return text.strip()
 
-def normalize(name):
-    return re.sub(r'[\s\(\)（）]', '', name)
+def extract_province_universities(html):
+    """(english_name, chinese_name) pairs from every wikitable with both name columns."""
+    pairs = []
+    for row in iter_name_rows(html):
+        eng_name = clean_text(row.english_name)
+        chi_name = clean_text(row.chinese_name)
+        if eng_name and chi_name:
+            pairs.append((eng_name, chi_name))
+    simplified = to_simplified_many(chi_name for _, chi_name in pairs)
+    return [(eng_name, chi_name) for (eng_name, _), chi_name in zip(pairs, simplified)]
 
-def update_all_provinces():
+def update_all_provinces(scraper=None):
+    """
+    Fills missing English names in china_universities.csv from the
+    per-province Wikipedia lists in province_links.json. Existing
+    English names are never overwritten.
+    """
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    json_path = os.path.join(base_dir, 'china_universities.json')
+    csv_path = os.path.join(base_dir, 'china_universities.csv')
     links_path = os.path.join(base_dir, 'province_links.json')
-    
-    if not os.path.exists(json_path):
-        print(f"Error: {json_path} not found.")
+
+    if not os.path.exists(csv_path):
+        print(f"Error: {csv_path} not found.")
         return
     if not os.path.exists(links_path):
         print(f"Error: {links_path} not found.")
         return
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        universities = json.load(f)
-    
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        universities = list(reader)
+
     with open(links_path, 'r', encoding='utf-8') as f:
-        province_import requests
-from bs4 import BeautifulSoup
-import json
-import os
-import re
-import time
+        province_links = json.load(f)
 
-def clean_te)}from bs4 imporerimport json
-import os
-import'Mimport os
- (import rh;import tac
-def clean5_7    if not text:
-    (        return ko    text = re.su72    text = re.sub(r'\[[a-z]{2}\]', '',ik    return text.strip()
+    uni_map = {}
+    for idx, uni in enumerate(universities):
+        uni_map.setdefault(normalize(uni['chinese_name']), idx)
 
-def normalize(nameur
-def normalize(name):
-       return re.sub(rin
-def update_all_provinces():
-    base_dir = ol h    base_dir = os.path.dir      json_path = os.path.join(base_dir, 'china_universiti..    links_path = os.path.    response = requests.get(url, headers=    
-    if not os.path.exists(json_path):
-        print(f"Er00             print(f"Error: {json_path} n {        return
-    if not os.path.exists(links c    if not os          print(f"Error: {links_path} np(        return
+    scraper = scraper or WikiScraper()
+    results = scraper.scrape(province_links, extract_province_universities)
 
-    with open(json_path, 'r', es 
-    with opell(        universities = json.load(f)
-    
-    with op      
-    with open(links_path, 'r'     ov        province_import requests
-from bs4 import Beaue from bs4 import BeautifulSoup
-i =import json
-import os
-import  import os
- nimport r
- import    
-def     contimport os
-import'Mimport os
- (import rh;adimport'M=  (import rh;impotrdef clean5_7    if non     (        return ko    t']
-def normalize(nameur
-def normalize(name):
-       return re.sub(rin
-def update_all_provinces():
-        idef normalize(name) h       return re.su'idef update_all_provincei;    base_dir = ol h    basr     if not os.path.exists(json_path):
-        print(f"Er00             print(f"Error: {json_path} n {        return
-    if not os.path.exists(links c    if not os          pr_n        print(f"Er00             pridx    if not os.path.exists(links c    if not os          print(f"Error: {linkls
-    with open(json_path, 'r', es 
-    with opell(        universities = json.load(f)
-    
-    with  
-     with opell(        universitco    
-    with op      
-    with open(links_path,            with open(li  from bs4 import Beaue from bs4 import BeautifulSoup
-i =import json
-  i =import json
-import os
-import  import os
- nimpor  import os
-i    import  br nimport r
- impo   import   
-def     co  import'Mimport os
- (am (import rhame:
-  def normalize(nameur
-def normalize(name):
-       return re.sub(rin
-def update  norm_chi = normadef normalize(name)         return re.su  def update_all_province:
-        idef normalize(nam          print(f"Er00             print(f"Error: {json_path} n {        return
-    if not os.path.exists(links c    if not os          pr_n  en    if not os.path.exists(links c    if not os          pr_n        print(f"_n    with open(json_path, 'r', es 
-    with opell(        universities = json.load(f)
-    
-    with  
-     with opell(        universitco    
-    with op      
-    with open(li      with opell(        universich(    
-    with  
-     with opell(        universit]'   ex     with      with op      
-    with open(links_      with open(li mi =import json
-  i =import json
-import os
-import  import os
- nimpor  import os
-i    import  br nimpor    i =import ji_import os
-impor  impo       nimpor  import  =i    import  br nme impo   import   
-def     def     co  imponi (am (import rhame:
-  def         idx = uni_map[nodef normalize(name):
-         re    provincedef update  norm_chi =           idef normalize(nam          print(f"Er00             print(f"Error: {json_path} n {  iv    if not os.path.exists(links c    if not os          pr_n  en    if not os.path.exists(links c    if       with opell(        universities = json.load(f)
-    
-    with  
-     with opell(        universitco    
-    with op      
-    with open(li      with opell(        universiio    
-    with  
-     with opell(        universith    n(     with,     with op      
-    with open(li    so .dump(universitie    with  
-     with opell(        universit]'   ex     M     withto    with open(links_      with open(li mi =import json
-  i =import __  i =import json
-import_provinces()
+    updated = 0
+    for url, pairs in results.items():
+        province_updates = 0
+        for eng_name, chi_name in pairs:
+            idx = uni_map.get(normalize(chi_name))
+            if idx is None:
+                continue
+            uni = universities[idx]
+            current = str(uni.get('english_name') or '').strip()
+            if current and current.lower() != 'nan':
+                continue
+            uni['english_name'] = eng_name.replace('"', "'").replace(',', ' ')
+            province_updates += 1
+        print(f"{url.rsplit('_in_', 1)[-1]}: {len(pairs)} listed, {province_updates} names filled")
+        updated += province_updates
+
+    if updated:
+        with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(universities)
+    print(f"Filled {updated} missing English names in {csv_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_scraper_arguments(parser)
+    update_all_provinces(WikiScraper.from_args(parser.parse_args()))
@@ -1,11 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import csv
 import os
 import re
-from opencc import OpenCC
+import sys
 
-cc = OpenCC('t2s')
+# Add project root to path to import the shared Wikipedia scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.wiki_scraper import WikiScraper, add_scraper_arguments
+from scripts.chinese_convert import to_simplified_many
+from scripts.wikitable import iter_tables
 
 def clean_text(text):
     if not text:
@@ -16,38 +19,18 @@ def clean_text(text):
     text = re.sub(r'\[[a-z]{2}\]', '', text)
     return text.strip()
 
-def normalize(name):
-    return re.sub(r'[\s\(\)（）]', '', name)
+HK_URL = "https://en.wikipedia.org/wiki/List_of_higher_education_institutions_in_Hong_Kong"
 
-def get_hk_universities():
-    url = "https://en.wikipedia.org/wiki/List_of_higher_education_institutions_in_Hong_Kong"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    print(f"Fetching {url}...")
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        print(f"Failed to fetch page: {response.status_code}")
-        return []
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-    tables = soup.find_all('table', {'class': 'wikitable'})
-    
+def extract_hk_universities(html):
     hk_list = []
     
-    for table in tables:
-        rows = table.find_all('tr')
-        if not rows:
-            continue
-            
-        for row in rows:
-            cols = row.find_all(['td', 'th'])
+    for table in iter_tables(html):
+        for cols in [table.header] + table.rows:
             if not cols:
                 continue
             
             # Usually the name is in the first column
-            name_cell = cols[0].get_text().strip()
+            name_cell = cols[0].strip()
             if not name_cell or name_cell.lower() == 'name':
                 continue
                 
@@ -62,8 +45,6 @@ def get_hk_universities():
                 chi_name = clean_text(name_cell[start:])
                 # Clean up Chinese name (take only the characters)
                 chi_name = re.sub(r'[^\u4e00-\u9fff]', '', chi_name)
-                # Convert to Simplified Chinese
-                chi_name = cc.convert(chi_name)
                 
                 if eng_name and chi_name:
                     hk_list.append({
@@ -73,19 +54,22 @@ def get_hk_universities():
             else:
                 # Some might be only English or only Chinese
                 if any('\u4e00' <= char <= '\u9fff' for char in name_cell):
-                    chi_name = cc.convert(clean_text(name_cell))
-                    hk_list.append({'english': '', 'chinese': chi_name})
+                    hk_list.append({'english': '', 'chinese': clean_text(name_cell)})
                 else:
                     hk_list.append({'english': clean_text(name_cell), 'chinese': ''})
 
+    # Convert to Simplified Chinese in one batch
+    for uni, chi_name in zip(hk_list, to_simplified_many(u['chinese'] for u in hk_list)):
+        uni['chinese'] = chi_name
     return hk_list
 
-def update_json():
+def update_json(scraper=None):
     base_dir = os.path.dirname(os.path.abspath(__file__))
     # Change output to a separate CSV file
     csv_path = os.path.join(base_dir, 'hk_universities.csv')
     
-    hk_universities = get_hk_universities()
+    scraper = scraper or WikiScraper()
+    hk_universities = scraper.scrape([HK_URL], extract_hk_universities)[HK_URL]
     print(f"Found {len(hk_universities)} universities in Hong Kong page.")
 
     if not hk_universities:
@@ -112,4 +96,6 @@ def update_json():
     print(f"saved {len(universities)} Hong Kong universities to {csv_path}.")
 
 if __name__ == "__main__":
-    update_json()
+    parser = argparse.ArgumentParser()
+    add_scraper_arguments(parser)
+    update_json(WikiScraper.from_args(parser.parse_args()))
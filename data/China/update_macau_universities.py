@@ -1,11 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import csv
 import os
 import re
-from opencc import OpenCC
+import sys
 
-cc = OpenCC('t2s')
+# Add project root to path to import the shared Wikipedia scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.wiki_scraper import WikiScraper, add_scraper_arguments
+from scripts.chinese_convert import to_simplified_many
+from scripts.wikitable import iter_tables
 
 def clean_text(text):
     if not text:
@@ -14,34 +17,19 @@ def clean_text(text):
     text = re.sub(r'\[[a-z]{2}\]', '', text)
     return text.strip()
 
-def normalize(name):
-    return re.sub(r'[\s\(\)（）]', '', name)
+MACAU_URL = "https://en.wikipedia.org/wiki/List_of_universities_and_colleges_in_Macau"
 
-def update_macau():
-    url = "https://en.wikipedia.org/wiki/List_of_universities_and_colleges_in_Macau"
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    # Output to separate file
-    csv_path = os.path.join(base_dir, 'macau_universities.csv')
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    print(f"Fetching {url}...")
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    table = soup.find('table', {'class': 'wikitable'})
+def extract_macau_universities(html):
+    table = next(iter_tables(html), None)
     
     macau_universities_list = []
     
     if table:
-        rows = table.find_all('tr')
-        for row in rows[1:]:
-            cols = row.find_all(['td', 'th'])
+        for cols in table.rows:
             if len(cols) >= 3:
                 # English, Portuguese, Chinese
-                eng_name = clean_text(cols[0].get_text())
-                chi_name = cc.convert(clean_text(cols[2].get_text()))
+                eng_name = clean_text(cols[0])
+                chi_name = clean_text(cols[2])
                 
                 if not eng_name or not chi_name: continue
                 
@@ -49,7 +37,23 @@ def update_macau():
                     "chinese_name": chi_name,
                     "english_name": eng_name
                 })
-                    
+
+    # Convert to Simplified Chinese in one batch
+    for uni, chi_name in zip(macau_universities_list, to_simplified_many(u["chinese_name"] for u in macau_universities_list)):
+        uni["chinese_name"] = chi_name
+    return macau_universities_list
+
+def update_macau(scraper=None):
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    # Output to separate file
+    csv_path = os.path.join(base_dir, 'macau_universities.csv')
+
+    scraper = scraper or WikiScraper()
+    macau_universities_list = scraper.scrape([MACAU_URL], extract_macau_universities)[MACAU_URL]
+    if not macau_universities_list:
+        print("No Macau universities found.")
+        return
+
     with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
         fieldnames = ['chinese_name', 'english_name']
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -60,4 +64,6 @@ def update_macau():
     print(f"Macau: Saved {len(macau_universities_list)} universities to {csv_path}")
 
 if __name__ == "__main__":
-    update_macau()
+    parser = argparse.ArgumentParser()
+    add_scraper_arguments(parser)
+    update_macau(WikiScraper.from_args(parser.parse_args()))
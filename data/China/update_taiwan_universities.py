@@ -1,11 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import csv
 import os
 import re
-from opencc import OpenCC
+import sys
 
-cc = OpenCC('t2s')
+# Add project root to path to import the shared Wikipedia scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.wiki_scraper import WikiScraper, add_scraper_arguments
+from scripts.chinese_convert import to_simplified_many
+from scripts.wikitable import iter_name_rows
 
 def clean_text(text):
     if not text:
@@ -14,61 +17,39 @@ def clean_text(text):
     text = re.sub(r'\[[a-z]{2}\]', '', text)
     return text.strip()
 
-def normalize(name):
-    # Remove all whitespace and common variations
-    return re.sub(r'[\s\(\)（）]', '', name)
+TAIWAN_URL = "https://en.wikipedia.org/wiki/List_of_universities_and_colleges_in_Taiwan"
 
-def update_taiwan():
-    url = "https://en.wikipedia.org/wiki/List_of_universities_and_colleges_in_Taiwan"
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    # Output to separate file
-    csv_path = os.path.join(base_dir, 'taiwan_universities.csv')
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    print(f"Fetching {url}...")
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    tables = soup.find_all('table', {'class': 'wikitable'})
-    
+def extract_taiwan_universities(html):
     taiwan_list = []
     
-    for table in tables:
-        # Identify name indices
-        header_row = table.find('tr')
-        if not header_row: continue
-        
-        headers_text = [h.get_text().strip().lower() for h in header_row.find_all(['th', 'td'])]
+    # The last name-like header is the English name, as before the shared parser
+    for row in iter_name_rows(html, last_english=True):
+        eng_name = clean_text(row.english_name)
+        chi_name = clean_text(row.chinese_name)
         
-        eng_idx = -1
-        chi_idx = -1
+        if not eng_name or not chi_name: continue
         
-        for i, h in enumerate(headers_text):
-            if 'chinese' in h:
-                chi_idx = i
-            elif 'name' in h or h == 'school' or h == 'institution':
-                eng_idx = i
-        
-        if eng_idx == -1 or chi_idx == -1:
-            continue
-            
-        rows = table.find_all('tr')
-        for row in rows[1:]:
-            cols = row.find_all(['td', 'th'])
-            if len(cols) > max(eng_idx, chi_idx):
-                eng_name = clean_text(cols[eng_idx].get_text())
-                chi_name = cc.convert(clean_text(cols[chi_idx].get_text()))
-                
-                if not eng_name or not chi_name: continue
-                
-                taiwan_list.append({
-                    "chinese_name": chi_name,
-                    "english_name": eng_name
-                })
-                    
+        taiwan_list.append({
+            "chinese_name": chi_name,
+            "english_name": eng_name
+        })
+
+    # Convert to Simplified Chinese in one batch
+    for uni, chi_name in zip(taiwan_list, to_simplified_many(u["chinese_name"] for u in taiwan_list)):
+        uni["chinese_name"] = chi_name
+    return taiwan_list
+
+def update_taiwan(scraper=None):
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    # Output to separate file
+    csv_path = os.path.join(base_dir, 'taiwan_universities.csv')
+
+    scraper = scraper or WikiScraper()
+    taiwan_list = scraper.scrape([TAIWAN_URL], extract_taiwan_universities)[TAIWAN_URL]
+    if not taiwan_list:
+        print("No Taiwan universities found.")
+        return
+
     with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
         fieldnames = ['chinese_name', 'english_name']
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -79,4 +60,6 @@ def update_taiwan():
     print(f"Saved {len(taiwan_list)} Taiwan universities to {csv_path}")
 
 if __name__ == "__main__":
-    update_taiwan()
+    parser = argparse.ArgumentParser()
+    add_scraper_arguments(parser)
+    update_taiwan(WikiScraper.from_args(parser.parse_args()))
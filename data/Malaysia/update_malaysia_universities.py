@@ -1,30 +1,13 @@
-import json
 import csv
 import os
-import subprocess
+import sys
+
+# Add project root to path to import the shared cscse fetcher
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.cscse_fetcher import CscseFetcher
 
 def fetch_universities(country_name, page_size=1000):
-    url = "https://yxcx.cscse.edu.cn/api/xlxwrzz/xlxwrz/getUniversityListOrPage"
-    payload = {
-        "country": country_name,
-        "currentPage": 1,
-        "pageSize": page_size,
-        "universityIndex": ""
-    }
-    
-    curl_command = [
-        "curl", "-s", "-X", "POST", url,
-        "-H", "Content-Type: application/json",
-        "-d", json.dumps(payload)
-    ]
-    
-    try:
-        process = subprocess.run(curl_command, capture_output=True, text=True, check=True)
-        result = json.loads(process.stdout)
-        return result.get("data", [])
-    except Exception as e:
-        print(f"Error fetching data for {country_name}: {e}")
-        return []
+    return CscseFetcher().fetch_country(country_name, page_size=page_size)
 
 def main():
     country = "马来西亚"
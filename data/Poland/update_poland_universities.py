@@ -1,47 +1,31 @@
 import json
 import csv
 import os
-import subprocess
 import sys
 
-# Add root to path to import gemini_translator
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from gemini_translator import GeminiTranslator
+# Add project root to path to import the translator, the shared cscse fetcher and the checkpoint journal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from main import make_translator, pack_batches
+from scripts.cscse_fetcher import CscseFetcher
+from scripts.checkpoint_journal import CheckpointJournal, atomic_write_csv
+from scripts.text_normalize import clean_name
 
 def fetch_poland_raw():
-    url = "https://yxcx.cscse.edu.cn/api/xlxwrzz/xlxwrz/getUniversityListOrPage"
-    payload = {
-        "country": "波兰",
-        "currentPage": 1,
-        "pageSize": 200,
-        "universityIndex": ""
-    }
-    
-    curl_command = [
-        "curl", "-s", "-X", "POST", url,
-        "-H", "Content-Type: application/json",
-        "-d", json.dumps(payload)
-    ]
-    
-    try:
-        process = subprocess.run(curl_command, capture_output=True, text=True, check=True)
-        result = json.loads(process.stdout)
-        data = result.get("data", [])
-        
-        # Save raw mapping
-        raw_mapping = [
-            {"chinese_name": item.get("CHINESE_NAME"), "original_name": item.get("ENGLISH_NAME")}
-            for item in data
-        ]
-        mapping_path = os.path.join(os.path.dirname(__file__), "poland_universities_raw.json")
-        with open(mapping_path, 'w', encoding='utf-8') as f:
-            json.dump(raw_mapping, f, ensure_ascii=False, indent=4)
-        print(f"Saved raw mapping to {mapping_path}")
-        return raw_mapping
-    except Exception as e:
-        print(f"Error fetching data: {e}")
+    data = CscseFetcher().fetch_country("波兰", page_size=200)
+    if not data:
         return []
 
+    # Save raw mapping
+    raw_mapping = [
+        {"chinese_name": item.get("CHINESE_NAME"), "original_name": item.get("ENGLISH_NAME")}
+        for item in data
+    ]
+    mapping_path = os.path.join(os.path.dirname(__file__), "poland_universities_raw.json")
+    with open(mapping_path, 'w', encoding='utf-8') as f:
+        json.dump(raw_mapping, f, ensure_ascii=False, indent=4)
+    print(f"Saved raw mapping to {mapping_path}")
+    return raw_mapping
+
 def load_existing_data(csv_path):
     existing = {}
     if os.path.exists(csv_path):
@@ -56,16 +40,9 @@ def load_existing_data(csv_path):
     return existing
 
 def save_to_csv(csv_path, data_dict):
-    with open(csv_path, mode='w', encoding='utf-8-sig', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["Chinese Name", "English Name"])
-        for cname, ename in data_dict.items():
-            # Clean wrapping quotes and internal quotes
-            ename = str(ename).strip()
-            if ename.startswith('"') and ename.endswith('"'):
-                ename = ename[1:-1].strip()
-            ename = ename.replace('"', "'").replace(',', ' ')
-            writer.writerow([cname, ename])
+    # Temp file + rename, so an interrupted save never leaves a truncated CSV
+    atomic_write_csv(csv_path, ["Chinese Name", "English Name"],
+                     ([cname, clean_name(ename)] for cname, ename in data_dict.items()))
 
 def main():
     mapping_path = os.path.join(os.path.dirname(__file__), "poland_universities_raw.json")
@@ -84,34 +61,43 @@ def main():
         return
 
     existing_translated = load_existing_data(csv_path)
+
+    # Batches translated since the last save of an interrupted run
+    journal = CheckpointJournal(csv_path + '.wal')
+    replayed = journal.replay()
+    if replayed:
+        existing_translated.update(replayed)
+        print(f"Recovered {len(replayed)} translations from {journal.path}")
     print(f"Found {len(raw_data)} universities total, {len(existing_translated)} already translated.")
 
-    translator = GeminiTranslator()
-    batch_size = 20
+    translator = make_translator()
     
     # Filter to only get untranslated ones
     to_translate = [item for item in raw_data if item['chinese_name'] not in existing_translated]
     
     if not to_translate:
+        if replayed:
+            journal.compact(lambda: save_to_csv(csv_path, existing_translated))
         print("All universities already translated.")
         return
 
-    for i in range(0, len(to_translate), batch_size):
-        batch = to_translate[i:i+batch_size]
-        print(f"Processing batch {i//batch_size + 1}/{(len(to_translate)-1)//batch_size + 1}...")
+    # Requests are filled up to a token budget rather than a fixed count
+    batches = pack_batches(to_translate, "Poland", "Polish")
+    for n, batch in enumerate(batches, 1):
+        print(f"Processing batch {n}/{len(batches)} ({len(batch)} names)...")
         translated_batch = translator.translate_university_names(batch, country="Poland", language="Polish")
         
         # Merge new translations
-        for item in translated_batch:
-            existing_translated[item['chinese_name']] = item['english_name']
+        batch_results = {item['chinese_name']: item['english_name'] for item in translated_batch}
+        existing_translated.update(batch_results)
         
-        # Save after each batch
-        save_to_csv(csv_path, existing_translated)
-        print(f"Batch saved. Total translated: {len(existing_translated)}")
-
-    print(f"Successfully finished. Results in {csv_path}")
+        # Log the batch; the CSV is rewritten only every few batches
+        if journal.append(batch_results, len(existing_translated)):
+            journal.compact(lambda: save_to_csv(csv_path, existing_translated))
+        print(f"Batch checkpointed. Total translated: {len(existing_translated)}")
 
-    print(f"Successfully saved {len(all_translated)} universities to {csv_path}")
+    journal.compact(lambda: save_to_csv(csv_path, existing_translated))
+    print(f"Successfully saved {len(existing_translated)} universities to {csv_path}")
 
 if __name__ == "__main__":
     main()
@@ -3,12 +3,13 @@ import csv
 import os
 import sys
 
-# Add parent directory to path to import gemini_translator
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from gemini_translator import GeminiTranslator
+# Add project root to path to import the translator and the checkpoint journal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from main import make_translator, pack_batches
+from scripts.checkpoint_journal import CheckpointJournal, atomic_write_csv
 
 def main():
-    translator = GeminiTranslator()
+    translator = make_translator()
     
     current_dir = os.path.dirname(os.path.abspath(__file__))
     raw_json_path = os.path.join(current_dir, "south_korea_universities_raw.json")
@@ -29,6 +30,13 @@ def main():
             for row in reader:
                 existing_data[row['Chinese Name']] = row['English Name']
 
+    # Batches translated since the last save of an interrupted run
+    journal = CheckpointJournal(csv_path + '.wal')
+    replayed = journal.replay()
+    if replayed:
+        existing_data.update(replayed)
+        print(f"Recovered {len(replayed)} translations from {journal.path}")
+
     to_translate = []
     for item in raw_data:
         chinese_name = item.get("CHINESE_NAME")
@@ -41,46 +49,48 @@ def main():
             })
     
     if not to_translate:
+        if replayed:
+            journal.compact(lambda: save_to_csv(csv_path, existing_data))
         print("Everything is already translated.")
         return
 
     print(f"Translating {len(to_translate)} South Korean universities...")
     
-    # Batch process translations
-    batch_size = 30
+    # Batch process translations, filling each request up to a token budget
     results = existing_data.copy()
     
-    for i in range(0, len(to_translate), batch_size):
-        batch = to_translate[i:i+batch_size]
-        print(f"Processing batch {i//batch_size + 1} (items {i} to {i+len(batch)})...")
+    done = 0
+    for n, batch in enumerate(pack_batches(to_translate, "South Korea", "Korean"), 1):
+        print(f"Processing batch {n} (items {done} to {done+len(batch)})...")
+        done += len(batch)
         # Ensure input to translator matches its specific expected schema:
         # list of dicts with {'chinese_name': ..., 'original_name': ...}
         translated_batch = translator.translate_university_names(batch, country="South Korea", language="Korean")
         
         if not translated_batch:
-            print(f"Warning: Batch {i//batch_size + 1} failed or returned no results.")
+            print(f"Warning: Batch {n} failed or returned no results.")
             continue
 
+        batch_results = {}
         for item in translated_batch:
             chinese_name = item.get("chinese_name")
             english_name = item.get("english_name")
             if chinese_name and english_name:
                 # Clean English name
-                english_name = str(english_name).replace('"', "'").replace(',', ' ')
-                results[chinese_name] = english_name
+                batch_results[chinese_name] = str(english_name).replace('"', "'").replace(',', ' ')
+        results.update(batch_results)
         
-        # Intermediate Save
-        save_to_csv(csv_path, results)
-        print(f"Saved progress to CSV ({len(results)} total items).")
+        # Checkpoint the batch; the CSV is rewritten only every few batches
+        if journal.append(batch_results, len(results)):
+            journal.compact(lambda: save_to_csv(csv_path, results))
+        print(f"Checkpointed progress ({len(results)} total items).")
 
+    journal.compact(lambda: save_to_csv(csv_path, results))
     print(f"Translation complete. Total entries: {len(results)}")
 
 def save_to_csv(path, data_dict):
-    with open(path, mode='w', encoding='utf-8-sig', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["Chinese Name", "English Name"])
-        for cn, en in sorted(data_dict.items()):
-            writer.writerow([cn, en])
+    # Temp file + rename, so an interrupted save never leaves a truncated CSV
+    atomic_write_csv(path, ["Chinese Name", "English Name"], sorted(data_dict.items()))
 
 if __name__ == "__main__":
     main()
@@ -1,132 +1,381 @@
 import os
-import glob
+import csv
 import re
 import json
-import pandas as pd
-from dotenv import load_dotenv
-import google.generativeai as genai
+import time
+import random
+import hashlib
+import argparse
+from collections import deque
+from scripts.countries import COUNTRY_MAP
+from scripts.summary_manifest import SummaryManifest
+from scripts.translation_cache import TranslationCache, MISSING
+from scripts.dataset import Dataset
+from scripts.summary_blocks import (SUMMARY_COLUMNS, country_labels, summary_block, load_summary_block,
+                                    iter_summary_chunks)
+from scripts.columnar_export import COLUMNAR_AVAILABLE, ColumnarWriter, write_columnar
+from scripts.translation_backends import Capabilities, TranslationBackend
 
-# Load environment variables
-load_dotenv(os.path.join(os.path.dirname(__file__), 'scripts', '.env'))
+# pandas, the Gemini SDK and dotenv are imported by the stages that need
+# them, so `python main.py summarize` on an unchanged tree starts fast.
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts', '.env')
+
+# Rough in-memory size of one parsed CSV row, used to turn the streaming
+# summary's memory budget into a chunk size
+ROW_BYTES_ESTIMATE = 1024
 
 # --- Configuration & Data ---
 
-# Complete Country Map (English Folder Name -> Chinese Name)
-COUNTRY_MAP = {
-    "China": "中国", "Japan": "日本", "Poland": "波兰", "Egypt": "埃及", "USA": "美国", "UK": "英国",
-    "Australia": "澳大利亚", "Malaysia": "马来西亚", "India": "印度", "Singapore": "新加坡", "Qatar": "卡塔尔",
-    "Ireland": "爱尔兰", "Philippines": "菲律宾", "Ethiopia": "埃塞俄比亚", "UAE": "阿联酋", "South Korea": "韩国",
-    "Bangladesh": "孟加拉国", "Moldova": "摩尔多瓦", "Russia": "俄罗斯", "France": "法国", "Germany": "德国",
-    "Afghanistan": "阿富汗", "Cambodia": "柬埔寨", "Canada": "加拿大", "Kenya": "肯尼亚", "Cameroon": "喀麦隆",
-    "South Africa": "南非", "Switzerland": "瑞士", "Sweden": "瑞典", "Vietnam": "越南", "Italy": "意大利",
-    "Israel": "以色列", "Fiji": "斐济", "Laos": "老挝", "Mongolia": "蒙古", "Norway": "挪威", "Sri Lanka": "斯里兰卡",
-    "Turkey": "土耳其", "New Zealand": "新西兰", "Georgia": "格鲁吉亚", "Netherlands": "荷兰", "Czech Republic": "捷克",
-    "Portugal": "葡萄牙", "Mexico": "墨西哥", "Spain": "西班牙", "Austria": "奥地利", "Angola": "安哥拉", "Andorra": "安道尔",
-    "Estonia": "爱沙尼亚", "Azerbaijan": "阿塞拜疆", "Algeria": "阿尔及利亚", "Albania": "阿尔巴尼亚", "Oman": "阿曼",
-    "Argentina": "阿根廷", "Bulgaria": "保加利亚", "Iceland": "冰岛", "North Macedonia": "北马其顿", "Botswana": "博茨瓦纳",
-    "Palestine": "巴勒斯坦", "Pakistan": "巴基斯坦", "Barbados": "巴巴多斯", "Panama": "巴拿马", "Brazil": "巴西",
-    "Burkina Faso": "布基纳法索", "Burundi": "布隆迪", "Belgium": "比利时", "Bosnia and Herzegovina": "波斯尼亚和黑塞哥维那",
-    "Bolivia": "玻利维亚", "Belarus": "白俄罗斯", "Peru": "秘鲁", "Benin": "贝宁共和国", "North Korea": "朝鲜", "Denmark": "丹麦",
-    "Togo": "多哥", "Dominican Republic": "多米尼加", "Ecuador": "厄瓜多尔", "Finland": "芬兰",
-    "Congo (Brazzaville)": "刚果（布）", "Congo (Kinshasa)": "刚果（金）", "Cuba": "古巴", "Colombia": "哥伦比亚",
-    "Costa Rica": "哥斯达黎加", "Grenada": "格林纳达", "Kazakhstan": "哈萨克斯坦", "Montenegro": "黑山", "Guinea": "几内亚",
-    "Ghana": "加纳", "Kyrgyzstan": "吉尔吉斯斯坦", "Zimbabwe": "津巴布韦", "Croatia": "克罗地亚", "Kuwait": "科威特",
-    "Ivory Coast": "科特迪瓦", "Liechtenstein": "列支敦士登", "Libya": "利比亚", "Liberia": "利比里亚", "Rwanda": "卢旺达",
-    "Luxembourg": "卢森堡", "Latvia": "拉脱维亚", "Lithuania": "立陶宛", "Romania": "罗马尼亚", "Lebanon": "黎巴嫩",
-    "Morocco": "摩洛哥", "Monaco": "摩纳哥", "Mauritius": "毛里求斯", "Myanmar": "缅甸", "Mozambique": "莫桑比克",
-    "Maldives": "马尔代夫", "Malawi": "马拉维", "Malta": "马耳他", "Madagascar": "马达加斯加", "Mali": "马里共和国",
-    "Nigeria": "尼日利亚", "Niger": "尼日尔", "Nepal": "尼泊尔", "Namibia": "纳米比亚", "Serbia": "塞尔维亚",
-    "Sierra Leone": "塞拉利昂", "Cyprus": "塞浦路斯", "Slovakia": "斯洛伐克", "Slovenia": "斯洛文尼亚", "Saudi Arabia": "沙特阿拉伯",
-    "Sudan": "苏丹", "Turkmenistan": "土库曼斯坦", "Tanzania": "坦桑尼亚", "Tajikistan": "塔吉克斯坦", "Thailand": "泰国",
-    "Trinidad and Tobago": "特立尼达和多巴哥", "Tunisia": "突尼斯", "Ukraine": "乌克兰", "Uzbekistan": "乌兹别克斯坦",
-    "Uganda": "乌干达", "Uruguay": "乌拉圭", "Guatemala": "危地马拉", "Venezuela": "委内瑞拉", "Brunei": "文莱",
-    "Hungary": "匈牙利", "Syria": "叙利亚", "Greece": "希腊", "Yemen": "也门", "Armenia": "亚美尼亚", "Iraq": "伊拉克",
-    "Iran": "伊朗", "Indonesia": "印度尼西亚", "Jamaica": "牙买加", "Jordan": "约旦", "Chile": "智利", "Zambia": "赞比亚"
-}
+# Instruction text sent with every translation batch. Its hash is the prompt
+# version used by the translation cache, so editing it invalidates old entries.
+TRANSLATION_PROMPT = (
+    "You are an expert academic translator. I will provide a list of universities in {country}. "
+    "Each entry contains a 'chinese_name' and an 'original_name' {lang_context}. "
+    "Please provide the official, most commonly used international English name for each university "
+    "based primarily on the 'original_name', using the 'chinese_name' only as secondary context. "
+    "IMPORTANT: Output MUST be in English. Translate terms like 'Universidad' to 'University', 'Ecole'/ 'École' to 'School', 'Institut' to 'Institute', 'Hochschule' to 'University of Applied Sciences', 'Facultad' to 'Faculty'. "
+    "FORCE TRANSLATION: Even if the university is known by its native name (e.g. 'Université libre de Bruxelles'), translate it to English (e.g. 'Free University of Brussels'). "
+    "Do NOT return the input name if it contains non-English academic terms (Universita, Hochschule, Ecole, etc.). "
+    "Respond strictly in JSON format as a list of objects, each containing the original 'chinese_name' and the new 'english_name'.\n\n"
+    "Data: {data}"
+)
+PROMPT_VERSION = hashlib.sha1(TRANSLATION_PROMPT.encode('utf-8')).hexdigest()[:12]
+
+
+def build_prompt(universities, country, language=None):
+    lang_context = f"(in {language})" if language else "(likely in the local language)"
+    return TRANSLATION_PROMPT.format(
+        country=country,
+        lang_context=lang_context,
+        data=json.dumps(universities, ensure_ascii=False)
+    )
+
+
+def pack_batches(universities, country, language=None, token_budget=4000, max_entries=None):
+    """
+    Splits one country's entries into requests of about `token_budget`
+    tokens, preamble included (see scripts/batch_packer.py).
+    """
+    from scripts.batch_packer import BatchPacker, estimate_tokens
+    preamble = estimate_tokens(build_prompt([], country, language))
+    return BatchPacker(token_budget, max_entries).pack(universities, preamble)
 
 # --- Classes ---
 
-class GeminiTranslator:
-    def __init__(self):
+class MalformedResponse(ValueError):
+    """The model replied, but not with a JSON list."""
+
+
+# HTTP statuses (and google.api_core exception names) worth retrying after a pause
+RETRYABLE_CODES = {429, 500, 503, 504}
+RETRYABLE_ERRORS = {'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'InternalServerError',
+                    'DeadlineExceeded'}
+
+
+def is_retryable(error):
+    code = getattr(error, 'code', None)
+    code = getattr(code, 'value', code) # grpc status enums
+    return code in RETRYABLE_CODES or type(error).__name__ in RETRYABLE_ERRORS
+
+
+def answer_status(item, names):
+    """
+    None if `item` isn't an answer for one of the `names` sent; otherwise
+    whether its english_name is usable (the model may answer "unknown").
+    """
+    if not isinstance(item, dict) or 'english_name' not in item:
+        return None
+    if not isinstance(item.get('chinese_name'), str) or item['chinese_name'] not in names:
+        return None
+    ename = str(item['english_name']).lower()
+    return not any(err in ename for err in ["error", "unknown", "n/a", "cannot translate"])
+
+
+class GeminiTranslator(TranslationBackend):
+    """
+    Remote translation backend (see scripts/translation_backends.py) on a
+    Gemini model; translate_batch/stream_batch are the TranslationBackend
+    names for translate_university_names/stream_university_names.
+    """
+    name = 'gemini'
+    capabilities = Capabilities(max_batch=None, concurrency=8, streaming=True, remote=True)
+    MODEL = 'gemini-2.0-flash'
+
+    # Retry policy of _translate_batch / _request_translations
+    MAX_ATTEMPTS = 5 # per request, on rate-limit/server errors
+    BACKOFF_BASE = 1.0 # seconds, doubled on each attempt
+    BACKOFF_MAX = 30.0
+    MISSING_ROUNDS = 2 # re-requests for names left out of a reply
+    MALFORMED_RETRIES = 2 # for a single name whose replies keep failing to parse
+
+    def __init__(self, cache_path=None, model_name=None):
+        self.cache = TranslationCache(cache_path) if cache_path else None
+        from dotenv import load_dotenv
+        load_dotenv(ENV_FILE)
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             # Try to check if we can run without API key (e.g. for normalization only)
             # But the translator needs it.
             print("Warning: GEMINI_API_KEY not found. Translation will fail.")
         else:
+            import google.generativeai as genai
             genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            self.model = genai.GenerativeModel(model_name or self.MODEL)
 
     def translate_university_names(self, universities, country="Poland", language=None):
         """
         universities: list of dicts with {'chinese_name': ..., 'original_name': ...}
         returns: list of dicts with {'chinese_name': ..., 'english_name': ...}
+
+        With a cache configured, entries answered before (including ones the
+        model failed to translate) are served from it and only the rest are sent.
         """
+        if self.cache is None:
+            return self._translate_batch(universities, country, language)[0]
+
+        cached, to_request = self._cache_lookup(universities, country, language)
+        if not to_request:
+            return cached
+
+        results, unreached = self._translate_batch([uni for _, uni in to_request], country, language)
+        self._cache_results(to_request, results, unreached)
+        return cached + results
+
+    def stream_university_names(self, universities, country="Poland", language=None):
+        """
+        Streaming counterpart of translate_university_names: yields each
+        {'chinese_name': ..., 'english_name': ...} item as soon as the model
+        has finished writing it, so the caller can apply and checkpoint
+        results while the rest of the batch is still being generated.
+        Whatever the stream didn't deliver (it broke off, turned malformed
+        or left names out) is then sent through the retrying batch path.
+        Cached answers come first; new ones are cached once the generator
+        is exhausted.
+        """
+        if self.cache is None:
+            cached, to_request = [], [(None, uni) for uni in universities]
+        else:
+            cached, to_request = self._cache_lookup(universities, country, language)
+        yield from cached
+        if not to_request:
+            return
         if not hasattr(self, 'model'):
              print("Gemini model not initialized.")
-             return []
+             return
 
-        lang_context = f"(in {language})" if language else "(likely in the local language)"
-        
-        prompt = (
-            f"You are an expert academic translator. I will provide a list of universities in {country}. "
-            f"Each entry contains a 'chinese_name' and an 'original_name' {lang_context}. "
-            f"Please provide the official, most commonly used international English name for each university "
-            f"based primarily on the 'original_name', using the 'chinese_name' only as secondary context. "
-            "IMPORTANT: Output MUST be in English. Translate terms like 'Universidad' to 'University', 'Ecole'/ 'École' to 'School', 'Institut' to 'Institute', 'Hochschule' to 'University of Applied Sciences', 'Facultad' to 'Faculty'. "
-            "FORCE TRANSLATION: Even if the university is known by its native name (e.g. 'Université libre de Bruxelles'), translate it to English (e.g. 'Free University of Brussels'). "
-            "Do NOT return the input name if it contains non-English academic terms (Universita, Hochschule, Ecole, etc.). "
-            "Respond strictly in JSON format as a list of objects, each containing the original 'chinese_name' and the new 'english_name'.\n\n"
-            f"Data: {json.dumps(universities, ensure_ascii=False)}"
-        )
-        
+        batch = [uni for _, uni in to_request]
+        names = {uni['chinese_name'] for uni in batch}
+        results = []
+        answered = set()
         try:
+            import google.generativeai as genai
+            from scripts.json_stream import JsonArrayStream
             response = self.model.generate_content(
-                prompt,
+                build_prompt(batch, country, language),
                 generation_config=genai.types.GenerationConfig(
                     response_mime_type="application/json"
-                )
+                ),
+                stream=True
             )
-            data = json.loads(response.text)
-            
-            if not isinstance(data, list):
-                print(f"Warning: Gemini returned non-list data.")
-                return []
-            
-            validated_data = []
-            for item in data:
-                if isinstance(item, dict) and 'chinese_name' in item and 'english_name' in item:
-                    ename = str(item['english_name']).lower()
-                    if any(err in ename for err in ["error", "unknown", "n/a", "cannot translate"]):
+            stream = JsonArrayStream()
+            for chunk in response:
+                for item in stream.feed(chunk.text):
+                    valid = answer_status(item, names)
+                    if valid is None or item['chinese_name'] in answered:
                         continue
-                    validated_data.append(item)
-            
-            return validated_data
+                    answered.add(item['chinese_name'])
+                    if valid:
+                        results.append(item)
+                        yield item
+            stream.close()
         except Exception as e:
-            print(f"Error calling Gemini: {e}")
-            return []
+            print(f"Streaming stopped early ({e}); retrying the rest as a batch.")
 
-class UniversityProjectManager:
-    def __init__(self):
-        self.project_root = os.path.dirname(os.path.abspath(__file__))
-        self.translator = GeminiTranslator()
+        rest = [uni for uni in batch if uni['chinese_name'] not in answered]
+        unreached = []
+        if rest:
+            retried, unreached = self._translate_batch(rest, country, language)
+            results.extend(retried)
+            yield from retried
+        if self.cache is not None:
+            self._cache_results(to_request, results, unreached)
+
+    def translate_batch(self, universities, country, language=None):
+        return self.translate_university_names(universities, country, language)
+
+    def stream_batch(self, universities, country, language=None):
+        return self.stream_university_names(universities, country, language)
+
+    def _cache_lookup(self, universities, country, language):
+        """Returns (cached result items, [(cache key, entry)] still to request)."""
+        cached = []
+        to_request = []
+        for uni in universities:
+            key = TranslationCache.key(PROMPT_VERSION, country, language, uni['chinese_name'], uni['original_name'])
+            hit = self.cache.get(key)
+            if hit is MISSING:
+                to_request.append((key, uni))
+            elif hit is not None:
+                cached.append({'chinese_name': uni['chinese_name'], 'english_name': hit})
+        return cached, to_request
+
+    def _cache_results(self, to_request, results, unreached):
+        # Names whose requests kept failing aren't recorded, so the next run retries them
+        by_name = {item['chinese_name']: item['english_name'] for item in results}
+        unreached = {uni['chinese_name'] for uni in unreached}
+        self.cache.put_many((key, by_name.get(uni['chinese_name'])) for key, uni in to_request
+                            if uni['chinese_name'] not in unreached)
+
+    def _translate_batch(self, universities, country, language):
+        """
+        Translates a batch, re-sending only what failed: names the model left
+        out are asked for again (up to MISSING_ROUNDS times), a malformed
+        reply splits the batch in half and each half is retried, and
+        rate-limit/server errors are retried with exponential backoff.
+        Returns (items, unreached) where `unreached` are the entries no
+        request for which ever got a usable reply.
+        """
+        if not hasattr(self, 'model'):
+             print("Gemini model not initialized.")
+             return [], list(universities)
+
+        results = []
+        unreached = []
+        queue = deque([(list(universities), 0, 0)]) # (batch, missing round, malformed retries)
+        while queue:
+            batch, missing_round, malformed = queue.popleft()
+            try:
+                items, answered = self._request_translations(batch, country, language)
+            except MalformedResponse as e:
+                if len(batch) > 1:
+                    mid = len(batch) // 2
+                    queue.appendleft((batch[mid:], missing_round, 0))
+                    queue.appendleft((batch[:mid], missing_round, 0))
+                elif malformed < self.MALFORMED_RETRIES:
+                    queue.appendleft((batch, missing_round, malformed + 1))
+                else:
+                    print(f"Warning: giving up on {batch[0]['chinese_name']}: {e}")
+                    unreached.extend(batch)
+                continue
+            except Exception as e:
+                print(f"Error calling Gemini: {e}")
+                unreached.extend(batch)
+                continue
+
+            results.extend(items)
+            missing = [uni for uni in batch if uni['chinese_name'] not in answered]
+            if missing and missing_round < self.MISSING_ROUNDS:
+                queue.append((missing, missing_round + 1, 0))
+        return results, unreached
+
+    def _request_translations(self, universities, country, language):
+        """
+        Sends one batch to Gemini, retrying rate-limit and server errors with
+        exponential backoff. Returns (validated items, names the reply
+        covered). Raises MalformedResponse if the reply isn't a JSON list.
+        """
+        prompt = build_prompt(universities, country, language)
+        names = {uni['chinese_name'] for uni in universities}
+
+        import google.generativeai as genai
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config=genai.types.GenerationConfig(
+                        response_mime_type="application/json"
+                    )
+                )
+                break
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                delay = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+        try:
+            data = json.loads(response.text)
+        except ValueError as e:
+            raise MalformedResponse(f"invalid JSON ({e})")
+        if not isinstance(data, list):
+            raise MalformedResponse("Gemini returned non-list data.")
         
-    def normalize_csv_files(self):
+        validated_data = []
+        answered = set()
+        for item in data:
+            valid = answer_status(item, names)
+            if valid is None:
+                continue
+            answered.add(item['chinese_name'])
+            if valid:
+                validated_data.append(item)
+        
+        return validated_data, answered
+
+def make_translator(backend='gemini', cache_path=None):
+    """
+    Translator for the given backend: 'gemini' (default) sends every name
+    to Gemini, 'local' only uses the offline rules (no network; names they
+    can't handle stay untranslated), and 'tiered' tries the rules first and
+    sends the rest to Gemini.
+    """
+    if backend == 'gemini':
+        return GeminiTranslator(cache_path=cache_path)
+    from scripts.translation_backends import RuleBasedBackend, TieredTranslator
+    if backend == 'local':
+        return TieredTranslator(RuleBasedBackend())
+    if backend == 'tiered':
+        return TieredTranslator(RuleBasedBackend(), GeminiTranslator(cache_path=cache_path))
+    raise ValueError(f"Unknown translation backend: {backend}")
+
+
+class UniversityProjectManager:
+    def __init__(self, project_root=None, translator=None, backend='gemini'):
+        self.project_root = project_root or os.path.dirname(os.path.abspath(__file__))
+        self.backend = backend
+        self._translator = translator
+        self._validator = None
+
+    @property
+    def translator(self):
+        """The translator for `backend`, configured on first use (only the translate stage needs it)."""
+        if self._translator is None:
+            self._translator = make_translator(
+                self.backend, cache_path=os.path.join(self.project_root, 'translation_cache.jsonl'))
+        return self._translator
+
+    @property
+    def validator(self):
+        if self._validator is None:
+            from scripts.english_validator import EnglishNameValidator
+            self._validator = EnglishNameValidator()
+        return self._validator
+
+    def load_dataset(self):
+        return Dataset(os.path.join(self.project_root, 'data'))
+
+    def normalize_csv_files(self, dataset=None):
         """
         Walks through all CSV files (excluding world_universities.csv),
         normalizes headers to 'chinese_name', 'english_name',
         and removes duplicates.
+
+        With a shared `dataset` the changes stay in memory until the caller
+        flushes it; without one, the files are loaded and flushed here.
         """
         print("Starting Normalization...")
-        # Search for csv files in data/[country]/[country]_universities.csv
-        csv_files = glob.glob(os.path.join(self.project_root, 'data', '*', '*_universities.csv'))
-        
-        for file_path in csv_files:
-            if 'world_universities.csv' in file_path:
+        own_dataset = dataset is None
+        if own_dataset:
+            dataset = self.load_dataset()
+
+        # data/[country]/[country]_universities.csv
+        for cf in dataset.select('_universities.csv'):
+            if cf.name == 'world_universities.csv':
                 continue
+            file_path = cf.path
                 
             try:
-                df = pd.read_csv(file_path, encoding='utf-8-sig')
+                df = cf.df.copy(deep=False)
                 original_columns = list(df.columns)
                 # Normalize headers: lower, strip, replace space with underscore
                 df.columns = [str(c).strip().lower().replace(' ', '_') for c in df.columns]
@@ -156,194 +405,362 @@ class UniversityProjectManager:
                 if cols_to_drop:
                     df.drop(columns=cols_to_drop, inplace=True)
                 
-                # Save back if changes occurred
+                # Keep the cleaned frame if changes occurred
                 if len(df) < initial_count or cols_to_drop or header_changed:
-                    df.to_csv(file_path, index=False, encoding='utf-8-sig')
-                    print(f"cleaned {os.path.basename(file_path)}: {initial_count} -> {len(df)} rows. Headers updated: {header_changed}")
+                    cf.df = df
+                    print(f"cleaned {cf.name}: {initial_count} -> {len(df)} rows. Headers updated: {header_changed}")
                     
             except Exception as e:
                 print(f"Error normalizing {file_path}: {e}")
 
+        if own_dataset:
+            dataset.flush()
+
     def is_valid_english(self, text):
-        if pd.isna(text) or str(text).strip() == "" or str(text).lower() == "nan":
-            return False
-        text_str = str(text)
+        return self.validator.is_valid(text)
 
-        # 1. Start with a strict ASCII check. 
-        # Most "International English" names should be ASCII. 
-        # If it contains accents (é, à, etc.) or non-latin scripts, assume it needs translation/normalization.
-        try:
-            text_str.encode('ascii')
-        except UnicodeEncodeError:
-            # Contains non-ASCII characters (Chinese, Cyrillic, or Latin accents like é, ü)
-            return False
-            
-        # 2. Keyword Checks for ASCII-based non-English terms
-        # Even if it is pure ASCII (e.g. "Universidad"), it might not be English.
-        text_lower = text_str.lower()
-        
-        # Terms that clearly indicate the name is NOT fully English
-        # We look for whole words to avoid false positives in substrings
-        bad_keywords = [
-            # Spanish / Portuguese / Italian
-            'universidad', 'facultad', 'escuela', 'politécnica', 'autónoma', 
-            'universidade', 'instituto', 'superior', 'nacional', 'católica', 'pontificia',
-            'degli', 'studi', 'accademia', 'politecnico',
-            # French (unaccented versions as ASCII check handled accented ones)
-            'universite', 'ecole', 'superieur', 'superieure', 'francais', 
-            'academie', 'conservatoire', 'royale',
-            # German / Dutch / Northern Europe
-            'universitat', 'hochschule', 'fachhochschule', 'akademie', 'hogeschool', 
-            'vrije', 'uniwersytet', 'politechnika', 'univerzita', 'vysoka', 'skola', 'egyetem'
-        ]
-        
-        # Simple word boundary check
-        # e.g. "ecole" should match "Ecole de..." but not "Molecule" (bad example but you get the idea)
-        # We'll just check valid separators or start/end of string
-        
-        for kw in bad_keywords:
-            # Check if keyword exists as a distinct word
-            pattern = r'(^|\s|[^a-z0-9])' + re.escape(kw) + r'($|\s|[^a-z0-9])'
-            if re.search(pattern, text_lower):
-                return False
+    def _select_for_translation(self, df):
+        """
+        Returns (mask, entries): a boolean mask of rows whose english_name is
+        missing or not valid English, and the matching
+        {'chinese_name', 'original_name'} dicts to send to the translator.
+        """
+        import pandas as pd
+        if 'english_name' in df.columns:
+            names = df['english_name']
+        else:
+            names = pd.Series('', index=df.index, dtype=object)
+        mask = ~self.validator.validate_series(names)
+        selected = pd.DataFrame({'chinese_name': df.loc[mask, 'chinese_name'], 'original_name': names[mask]})
+        return mask, selected.to_dict('records')
 
-        return True
+    def _apply_translations(self, df, mask, translation_map):
+        """
+        Writes translations for the masked rows back into df in one masked
+        assignment. Returns the number of rows whose english_name changed.
+        """
+        if not translation_map:
+            return 0
+        if 'english_name' not in df.columns:
+            df['english_name'] = None
+        new_names = df.loc[mask, 'chinese_name'].map(translation_map)
+        changed = new_names.notna() & (new_names != df.loc[mask, 'english_name'])
+        if changed.any():
+            df.loc[changed[changed].index, 'english_name'] = new_names[changed]
+        return int(changed.sum())
 
-    def translate_missing_or_bad_names(self):
+    def translate_missing_or_bad_names(self, dataset=None, batch_size=None, concurrency=4, requests_per_second=None,
+                                       token_budget=4000):
         """
         Scans all CSVs. If english_name is missing or invalid, translates it.
+        Names are pooled per country (across its files) and packed into
+        requests of about `token_budget` tokens, optionally capped at
+        `batch_size` names. Batches from every country go through one
+        TranslationScheduler so up to `concurrency` requests are in flight at
+        once (optionally capped at `requests_per_second`); results are
+        applied per file in sorted order.
+        As with normalize_csv_files, a shared `dataset` is left for the caller to flush.
         """
         print("\nStarting Translation Tasks...")
-        csv_files = glob.glob(os.path.join(self.project_root, 'data', '*', '*_universities.csv'))
-        
-        for file_path in csv_files:
-            if 'China' in file_path: continue 
+        own_dataset = dataset is None
+        if own_dataset:
+            dataset = self.load_dataset()
+
+        by_country = {}
+        pending = []
+        for cf in dataset.select('_universities.csv'):
+            if cf.country == 'China': continue 
             
-            relative_path = os.path.relpath(file_path, os.path.join(self.project_root, 'data'))
-            country_name = os.path.dirname(relative_path) 
+            relative_path = os.path.join(cf.country, cf.name)
+            country_name = cf.country
             
             try:
-                df = pd.read_csv(file_path, encoding='utf-8-sig')
+                df = cf.df.copy(deep=False)
                 
-                to_translate = []
-                indices = []
-                
-                for idx, row in df.iterrows():
-                    cname = row['chinese_name']
-                    ename = row.get('english_name', '')
-                    
-                    if not self.is_valid_english(ename):
-                        to_translate.append({
-                            "chinese_name": cname,
-                            "original_name": ename 
-                        })
-                        indices.append(idx)
-                
-                if not to_translate:
-                    continue
-                    
-                print(f"translating {len(to_translate)} names for {country_name}...")
-                
-                # Batch translation
-                batch_size = 20
-                translation_map = {}
+                mask, to_translate = self._select_for_translation(df)
+            except Exception as e:
+                print(f"Error translating {relative_path}: {e}")
+                continue
                 
-                for i in range(0, len(to_translate), batch_size):
-                    batch = to_translate[i:i+batch_size]
-                    results = self.translator.translate_university_names(batch, country=country_name, language=None)
-                    for res in results:
-                        translation_map[res['chinese_name']] = res['english_name']
+            if not to_translate:
+                continue
                 
-                # Apply updates
-                updated_count = 0
-                for idx in indices:
-                    cname = df.at[idx, 'chinese_name']
-                    if cname in translation_map:
-                        df.at[idx, 'english_name'] = translation_map[cname]
-                        updated_count += 1
+            print(f"translating {len(to_translate)} names for {country_name}...")
+            
+            # Pooled with the country's other files; a name shared between
+            # them is sent once
+            entries = by_country.setdefault(country_name, {})
+            for uni in to_translate:
+                entries.setdefault(uni['chinese_name'], uni)
+            pending.append((cf, relative_path, df, mask))
+
+        # Queue batches; they are sent together with every other country's.
+        # A tiered translator answers what its local backend can up front,
+        # so only the rest is packed into requests
+        split = getattr(self.translator, 'split', None)
+        # Without a remote backend (--backend local) the rest can't be translated at all
+        local_only = split is not None and self.translator.remote is None
+        results = {}
+        jobs = []
+        untranslated = 0
+        for country_name, entries in by_country.items():
+            entries = list(entries.values())
+            if split:
+                results[country_name], entries = split(entries, country_name)
+            if local_only:
+                untranslated += len(entries)
+                continue
+            for batch in pack_batches(entries, country_name, token_budget=token_budget, max_entries=batch_size):
+                jobs.append((country_name, batch, country_name, None))
+        if untranslated:
+            print(f"{untranslated} names left untranslated (no remote backend).")
+
+        if jobs:
+            from scripts.translation_scheduler import TranslationScheduler
+            capabilities = getattr(self.translator, 'capabilities', None)
+            if capabilities:
+                concurrency = min(concurrency, capabilities.concurrency)
+            scheduler = TranslationScheduler(self.translator, concurrency=concurrency,
+                                             requests_per_second=requests_per_second)
+            for country_name, items in scheduler.run(jobs).items():
+                results.setdefault(country_name, []).extend(items)
+
+        for cf, relative_path, df, mask in pending:
+            translation_map = {res['chinese_name']: res['english_name'] for res in results.get(cf.country, [])}
+            
+            try:
+                updated_count = self._apply_translations(df, mask, translation_map)
                 
                 if updated_count > 0:
-                    df.to_csv(file_path, index=False, encoding='utf-8-sig')
+                    cf.df = df
                     print(f"Updated {updated_count} names in {relative_path}")
                     
             except Exception as e:
                 print(f"Error translating {relative_path}: {e}")
 
-    def generate_global_summary(self):
+        if own_dataset:
+            dataset.flush()
+
+    def generate_global_summary(self, dataset=None, incremental=True, workers=1, dedupe=False):
+        """
+        Rebuilds world_universities.csv. With incremental=True (default) a
+        manifest next to the output remembers each country file's stat/hash
+        and cleaned rows, so only changed files are re-parsed and an
+        unchanged tree returns without touching the output at all.
+        A shared `dataset` is flushed first so the manifest sees its writes.
+        With workers > 1, stale files not already in memory are read and
+        cleaned on a process pool; results are merged in file order.
+        With dedupe=True, clusters of duplicate rows across the whole table
+        (see scripts/dedup.py) are merged into their first row.
+        """
         print("\nGenerating World Summary...")
-        all_dfs = []
-        
+
         data_root = os.path.join(self.project_root, 'data')
         if not os.path.exists(data_root):
             print(f"Error: Data directory not found at {data_root}")
             return
 
-        # Search for all csv files in subdirectories of data/
-        for item in os.listdir(data_root):
-            item_path = os.path.join(data_root, item)
-            if os.path.isdir(item_path) and not item.startswith('.'):
-                for file in os.listdir(item_path):
-                    if file.endswith('.csv'):
-                        file_path = os.path.join(item_path, file)
-                        try:
-                            df = pd.read_csv(file_path, encoding='utf-8-sig')
-                            # Normalize internal columns just in case
-                            df.columns = [c.strip().lower().replace(' ', '_') for c in df.columns]
-
-                            if 'chinese_name' in df.columns and 'english_name' in df.columns:
-                                # Clean English Name
-                                df['english_name'] = df['english_name'].astype(str).str.replace(',', ' ', regex=False)
-                                
-                                def clean_quotes(s):
-                                    s = s.strip()
-                                    if len(s) >= 2 and s.startswith('"') and s.endswith('"'):
-                                        s = s[1:-1].strip()
-                                    return s.replace('"', "'")
-                                
-                                df['english_name'] = df['english_name'].apply(clean_quotes)
-                                
-                                # Add country columns
-                                df['country_english'] = item
-                                df['country_chinese'] = COUNTRY_MAP.get(item, item) 
-                                
-                                # Special handling for China regions
-                                if item == 'China':
-                                    if 'hk_universities.csv' in file or 'hong_kong' in file.lower():
-                                        df['country_english'] = 'Hong Kong'
-                                        df['country_chinese'] = '中国香港'
-                                    elif 'macau_universities.csv' in file or 'macao' in file.lower():
-                                        df['country_english'] = 'Macau'
-                                        df['country_chinese'] = '中国澳门'
-                                    elif 'taiwan_universities.csv' in file or 'taiwan' in file.lower():
-                                        df['country_english'] = 'Taiwan'
-                                        df['country_chinese'] = '中国台湾'
-                                
-                                all_dfs.append(df[['chinese_name', 'english_name', 'country_chinese', 'country_english']])
-                            else:
-                                pass # Skipping verbose invalid files
-                        except Exception as e:
-                            print(f"Error reading {file_path}: {e}")
-        
-        if all_dfs:
-            summary_df = pd.concat(all_dfs, ignore_index=True)
-            summary_df.sort_values(by='country_english', inplace=True)
-            
-            output_file = os.path.join(self.project_root, 'world_universities.csv')
-            summary_df.insert(0, '_id', range(1, len(summary_df) + 1))
-            
-            summary_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-            print(f"Successfully generated {output_file} with {len(summary_df)} entries.")
-        else:
+        output_file = os.path.join(self.project_root, 'world_universities.csv')
+        columnar_file = os.path.join(self.project_root, 'world_universities.feather')
+        manifest = SummaryManifest(os.path.join(self.project_root, 'world_universities.manifest.json'))
+        if not incremental:
+            manifest.clear()
+
+        if dataset is None:
+            dataset = self.load_dataset()
+        dataset.flush()
+
+        # All csv files in subdirectories of data/; only stale ones get read
+        keys = []
+        stale = []
+        for cf in dataset:
+            try:
+                st = os.stat(cf.path)
+            except OSError as e:
+                print(f"Error reading {cf.path}: {e}")
+                continue
+            keys.append(cf.key)
+            if not manifest.is_fresh(cf.key, st):
+                stale.append((cf, st))
+
+        # Files already loaded by an earlier stage are cleaned in-process;
+        # with workers > 1 the rest are read and cleaned on a process pool.
+        pooled = [cf for cf, _ in stale if not cf.loaded] if workers > 1 else []
+        results = {}
+        if pooled:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    (cf.key, pool.submit(load_summary_block, cf.path, cf.country,
+                                         COUNTRY_MAP.get(cf.country, cf.country), cf.name))
+                    for cf in pooled
+                ]
+                for key, future in futures:
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        results[key] = e
+
+        changed = 0
+        failed = set()
+        for cf, st in stale:
+            try:
+                result = results.get(cf.key)
+                if isinstance(result, Exception):
+                    raise result
+                digest = result[0] if result else manifest.file_digest(cf.raw)
+                if not manifest.matches_digest(cf.key, st, digest):
+                    if result:
+                        rows = result[1]
+                    else:
+                        rows = summary_block(cf.df, cf.country, COUNTRY_MAP.get(cf.country, cf.country), cf.name)
+                    manifest.update(cf.key, st, digest, rows)
+                    changed += 1
+            except Exception as e:
+                failed.add(cf.key)
+                print(f"Error reading {cf.path}: {e}")
+        keys = [key for key in keys if key not in failed]
+
+        removed = manifest.prune(set(keys))
+        columnar_current = not COLUMNAR_AVAILABLE or os.path.exists(columnar_file)
+        options = {'dedupe': True} if dedupe else None
+        if not changed and not removed and manifest.output_matches(output_file, options) and columnar_current:
+            manifest.save()
+            print(f"{output_file} is up to date.")
+            return
+
+        # Splice the cached blocks back together; the sort is stable so rows
+        # keep their per-file order within each country.
+        rows = [row for key in keys for row in manifest.rows(key)]
+        if not rows:
             print("No valid CSV files found.")
+            return
+        rows.sort(key=lambda r: r[3])
+        merged = 0
+        if dedupe:
+            from scripts.dedup import DuplicateDetector, merge_duplicates
+            count = len(rows)
+            rows = merge_duplicates(rows, DuplicateDetector().clusters(rows))
+            merged = count - len(rows)
+
+        with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['_id'] + SUMMARY_COLUMNS)
+            for i, row in enumerate(rows, 1):
+                writer.writerow([i] + row)
+        write_columnar(rows, SUMMARY_COLUMNS, columnar_file)
+
+        manifest.record_output(output_file, options)
+        manifest.save()
+        print(f"Successfully generated {output_file} with {len(rows)} entries ({changed} files re-parsed).")
+        if dedupe:
+            print(f"Merged {merged} duplicate rows.")
+
+    def stream_global_summary(self, dataset=None, memory_budget_mb=64):
+        """
+        Constant-memory rebuild of world_universities.csv. Files are visited
+        in country_english order (stable within a country, as in the sorted
+        build), so rows are written as soon as they are cleaned, under a
+        running _id, and nothing is concatenated or sorted. Files not already
+        in memory are read in chunks sized to `memory_budget_mb`. The output
+        is identical to generate_global_summary's; the manifest isn't used.
+        """
+        print("\nGenerating World Summary (streaming)...")
+
+        data_root = os.path.join(self.project_root, 'data')
+        if not os.path.exists(data_root):
+            print(f"Error: Data directory not found at {data_root}")
+            return
+
+        output_file = os.path.join(self.project_root, 'world_universities.csv')
+        columnar_file = os.path.join(self.project_root, 'world_universities.feather')
+        chunksize = max(1000, memory_budget_mb * 1024 * 1024 // ROW_BYTES_ESTIMATE)
+
+        if dataset is None:
+            dataset = self.load_dataset()
+        dataset.flush()
+
+        files = []
+        for cf in dataset:
+            country_chinese = COUNTRY_MAP.get(cf.country, cf.country)
+            files.append((country_labels(cf.country, country_chinese, cf.name), cf, country_chinese))
+        files.sort(key=lambda f: f[0][0])
+
+        columnar = ColumnarWriter(columnar_file, SUMMARY_COLUMNS, {
+            'country_english': [labels[0] for labels, _, _ in files],
+            'country_chinese': [labels[1] for labels, _, _ in files],
+        })
+        tmp_output = output_file + '.tmp'
+        count = 0
+        with open(tmp_output, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['_id'] + SUMMARY_COLUMNS)
+            for _, cf, country_chinese in files:
+                try:
+                    if cf.loaded:
+                        chunks = [summary_block(cf.df, cf.country, country_chinese, cf.name)]
+                    else:
+                        chunks = iter_summary_chunks(cf.path, cf.country, country_chinese, cf.name, chunksize)
+                    for rows in chunks:
+                        writer.writerows([count + i] + row for i, row in enumerate(rows, 1))
+                        columnar.write(rows)
+                        count += len(rows)
+                except Exception as e:
+                    print(f"Error reading {cf.path}: {e}")
+
+        if not count:
+            os.remove(tmp_output)
+            columnar.discard()
+            print("No valid CSV files found.")
+            return
+        os.replace(tmp_output, output_file)
+        columnar.close()
+        print(f"Successfully generated {output_file} with {count} entries (streamed).")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize, translate and summarize the university lists.")
+    parser.add_argument('command', nargs='?', default='all', choices=['normalize', 'translate', 'summarize', 'all'])
+    parser.add_argument('--backend', default='gemini', choices=['gemini', 'tiered', 'local'],
+                        help="translation engine: Gemini only (default), offline rules first then Gemini, "
+                             "or offline rules only")
+    parser.add_argument('--token-budget', type=int, default=4000,
+                        help="estimated tokens per translation request, prompt and reply included")
+    parser.add_argument('--batch-size', type=int, default=None, help="cap on names per translation request")
+    parser.add_argument('--concurrency', type=int, default=4, help="translation requests in flight")
+    parser.add_argument('--rps', type=float, default=None, help="cap on translation requests per second")
+    parser.add_argument('--workers', type=int, default=1, help="processes for re-parsing changed files in the summary")
+    parser.add_argument('--full', action='store_true', help="rebuild the summary from scratch, ignoring the manifest")
+    parser.add_argument('--stream', action='store_true',
+                        help="write the summary file by file in constant memory (always a full rebuild)")
+    parser.add_argument('--memory-mb', type=int, default=64, help="memory budget for --stream")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="merge duplicate rows across countries in the summary (not with --stream)")
+    args = parser.parse_args(argv)
+    if args.dedupe and args.stream:
+        parser.error("--dedupe needs the whole table and can't be combined with --stream")
+
+    manager = UniversityProjectManager(backend=args.backend)
+    # Every country file is read once and shared by all stages that run
+    dataset = manager.load_dataset()
 
-if __name__ == "__main__":
-    manager = UniversityProjectManager()
-    
     # Step 1: Normalize all CSVs
-    manager.normalize_csv_files()
-    
+    if args.command in ('normalize', 'all'):
+        manager.normalize_csv_files(dataset)
+
     # Step 2: Translate missing or non-English names
-    manager.translate_missing_or_bad_names()
-    
-    # Step 3: Global Summary
-    manager.generate_global_summary()
\ No newline at end of file
+    if args.command in ('translate', 'all'):
+        manager.translate_missing_or_bad_names(dataset, batch_size=args.batch_size, concurrency=args.concurrency,
+                                               requests_per_second=args.rps, token_budget=args.token_budget)
+
+    # Step 3: Global Summary (writes back changed country files first)
+    if args.command in ('summarize', 'all'):
+        if args.stream:
+            manager.stream_global_summary(dataset, memory_budget_mb=args.memory_mb)
+        else:
+            manager.generate_global_summary(dataset, incremental=not args.full, workers=args.workers,
+                                            dedupe=args.dedupe)
+    else:
+        dataset.flush()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
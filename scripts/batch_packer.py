@@ -0,0 +1,65 @@
+"""
+Sizes translation requests by an estimated token budget instead of a
+fixed number of names.
+
+Every request repeats the instruction preamble, so a handful of short
+names per call spends most of the budget (and the per-request latency)
+on the preamble. BatchPacker fills each request with consecutive
+entries until the preamble plus the estimated input and output tokens
+of the entries reach `token_budget`. Entries should come grouped by
+country (one prompt per country), and their order is kept, so resumable
+scripts see the same batches on every run.
+"""
+import re
+import json
+
+# CJK, kana and hangul characters are roughly a token each; other text
+# runs about four characters per token
+WIDE = re.compile(r'[ᄀ-ᇿ぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]')
+CHARS_PER_TOKEN = 4
+# The reply repeats chinese_name next to an english_name; assume the
+# English name is at least this long
+MIN_ENGLISH_CHARS = 24
+
+
+def estimate_tokens(text):
+    wide = len(WIDE.findall(text))
+    return wide + -(-(len(text) - wide) // CHARS_PER_TOKEN)
+
+
+def entry_tokens(entry):
+    """Estimated tokens an entry adds to a request: its JSON in the prompt plus its reply."""
+    sent = json.dumps(entry, ensure_ascii=False)
+    english = max(len(str(entry.get('original_name') or '')), MIN_ENGLISH_CHARS)
+    reply = json.dumps({'chinese_name': entry.get('chinese_name'), 'english_name': 'x' * english},
+                       ensure_ascii=False)
+    # +2 each for the ", " between list items
+    return estimate_tokens(sent) + estimate_tokens(reply) + 2
+
+
+class BatchPacker:
+    def __init__(self, token_budget=4000, max_entries=None):
+        self.token_budget = token_budget
+        self.max_entries = max_entries
+
+    def pack(self, entries, preamble_tokens=0):
+        """
+        Splits `entries` into consecutive batches of at most token_budget
+        estimated tokens (and at most max_entries entries). An entry too
+        large for any batch is sent on its own.
+        """
+        batches = []
+        batch = []
+        used = preamble_tokens
+        for entry in entries:
+            cost = entry_tokens(entry)
+            full = self.max_entries is not None and len(batch) >= self.max_entries
+            if batch and (full or used + cost > self.token_budget):
+                batches.append(batch)
+                batch = []
+                used = preamble_tokens
+            batch.append(entry)
+            used += cost
+        if batch:
+            batches.append(batch)
+        return batches
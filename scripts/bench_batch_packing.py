@@ -0,0 +1,143 @@
+"""
+Compares fixed-size translation batches (20 names per file, as before)
+with token-budget packing pooled per country, for a full retranslation
+of every non-China list under data/. Requests go through the real
+GeminiTranslator and TranslationScheduler to a local fake model that
+tokenizes each prompt and reply, and sleeps for a latency made of a
+fixed per-request cost plus per-token input and output costs (scaled
+down by --time-scale; times are reported unscaled).
+
+    python scripts/bench_batch_packing.py --token-budget 4000 --concurrency 4
+"""
+import os
+import re
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from main import GeminiTranslator, pack_batches
+from scripts.translation_scheduler import TranslationScheduler
+
+# Rough stand-in for a subword tokenizer: one token per CJK character,
+# per punctuation mark and per (up to) four letters of a word
+TOKENS = re.compile(r'[ᄀ-ᇿ぀-ヿ㐀-䶿一-鿿가-힯]|\w{1,4}|[^\w\s]')
+
+
+def count_tokens(text):
+    return len(TOKENS.findall(text))
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class TokenCountingModel:
+    def __init__(self, request_latency, input_rate, output_rate, time_scale, max_output_tokens):
+        self.request_latency = request_latency
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.time_scale = time_scale
+        self.max_output_tokens = max_output_tokens
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.truncated = 0
+        self.latency = 0.0
+
+    def generate_content(self, prompt, generation_config=None):
+        data = json.loads(prompt.split('Data: ', 1)[1])
+        reply = json.dumps([{'chinese_name': d['chinese_name'], 'english_name': f"University of {d['original_name']}"}
+                            for d in data], ensure_ascii=False)
+        tokens_in, tokens_out = count_tokens(prompt), count_tokens(reply)
+        truncated = tokens_out > self.max_output_tokens
+        if truncated:
+            # Cut off mid-reply, as a model hitting its output limit does
+            tokens_out = self.max_output_tokens
+            reply = reply[:len(reply) * self.max_output_tokens // count_tokens(reply)]
+        latency = self.request_latency + tokens_in / self.input_rate + tokens_out / self.output_rate
+        with self.lock:
+            self.requests += 1
+            self.input_tokens += tokens_in
+            self.output_tokens += tokens_out
+            self.truncated += truncated
+            self.latency += latency
+        time.sleep(latency * self.time_scale)
+        return FakeResponse(reply)
+
+
+def load_entries():
+    """{country: {file: [{'chinese_name', 'original_name'}, ...]}} for every non-China list."""
+    entries = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, 'data', '*', '*_universities.csv'))):
+        country = os.path.basename(os.path.dirname(path))
+        if country == 'China':
+            continue
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = [{'chinese_name': r.get('chinese_name') or '', 'original_name': r.get('english_name') or ''}
+                    for r in csv.DictReader(f)]
+        entries.setdefault(country, {})[os.path.basename(path)] = [r for r in rows if r['chinese_name']]
+    return entries
+
+
+def fixed_jobs(entries, batch_size):
+    jobs = []
+    for country, files in entries.items():
+        for name, rows in files.items():
+            for i in range(0, len(rows), batch_size):
+                jobs.append((country, rows[i:i + batch_size], country, None))
+    return jobs
+
+
+def packed_jobs(entries, token_budget):
+    jobs = []
+    for country, files in entries.items():
+        pooled = {}
+        for rows in files.values():
+            for row in rows:
+                pooled.setdefault(row['chinese_name'], row)
+        for batch in pack_batches(list(pooled.values()), country, token_budget=token_budget):
+            jobs.append((country, batch, country, None))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--batch-size', type=int, default=20, help="fixed batch size to compare against")
+    parser.add_argument('--token-budget', type=int, default=4000)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--request-latency', type=float, default=0.4, help="seconds per request")
+    parser.add_argument('--input-rate', type=float, default=20000, help="input tokens per second")
+    parser.add_argument('--output-rate', type=float, default=200, help="output tokens per second")
+    parser.add_argument('--max-output-tokens', type=int, default=8192)
+    parser.add_argument('--time-scale', type=float, default=0.01, help="fraction of the modelled latency to sleep")
+    args = parser.parse_args()
+
+    entries = load_entries()
+    names = sum(len(rows) for files in entries.values() for rows in files.values())
+    print(f"{names} names in {len(entries)} countries, concurrency {args.concurrency}")
+    for label, jobs in (('fixed', fixed_jobs(entries, args.batch_size)),
+                        ('packed', packed_jobs(entries, args.token_budget))):
+        model = TokenCountingModel(args.request_latency, args.input_rate, args.output_rate,
+                                   args.time_scale, args.max_output_tokens)
+        translator = GeminiTranslator.__new__(GeminiTranslator)
+        translator.cache = None
+        translator.model = model
+        start = time.perf_counter()
+        results = TranslationScheduler(translator, concurrency=args.concurrency).run(jobs)
+        wall = (time.perf_counter() - start) / args.time_scale
+        translated = sum(len(v) for v in results.values())
+        print(f"{label:7} requests {model.requests:5}  input tokens {model.input_tokens:8}  "
+              f"output tokens {model.output_tokens:7}  wall {wall:7.1f}s  "
+              f"translated {translated}  truncated {model.truncated}")
+
+
+if __name__ == "__main__":
+    main()
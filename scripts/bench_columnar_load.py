@@ -0,0 +1,61 @@
+"""
+Compares cold-loading world_universities.csv with pandas against loading
+the memory-mapped world_universities.feather, in fresh subprocesses so
+each measurement includes import and page-cache-warm file access only.
+
+    python scripts/bench_columnar_load.py
+"""
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADERS = {
+    'csv (pandas.read_csv)': (
+        "import pandas as pd\n"
+        "df = pd.read_csv(os.path.join(ROOT, 'world_universities.csv'), encoding='utf-8-sig')\n"
+    ),
+    'feather -> pandas': (
+        "from scripts.columnar_export import load_columnar\n"
+        "df = load_columnar(os.path.join(ROOT, 'world_universities.feather'))\n"
+    ),
+    'feather -> arrow (mmap)': (
+        "from scripts.columnar_export import load_columnar\n"
+        "df = load_columnar(os.path.join(ROOT, 'world_universities.feather'), as_pandas=False)\n"
+    ),
+}
+
+TEMPLATE = """
+import os, sys, time, json, resource
+ROOT = {root!r}
+sys.path.insert(0, ROOT)
+import pandas, pyarrow
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': elapsed, 'rows': len(df), 'rss_kb': rss_after - rss_before}}))
+"""
+
+
+def main():
+    if not os.path.exists(os.path.join(ROOT, 'world_universities.feather')):
+        print("world_universities.feather not found; run main.py (summary stage) first.")
+        return
+    repeats = 5
+    for label, body in LOADERS.items():
+        runs = []
+        for _ in range(repeats):
+            out = subprocess.run([sys.executable, '-c', TEMPLATE.format(root=ROOT, body=body)],
+                                 capture_output=True, text=True, check=True)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        best = min(r['seconds'] for r in runs)
+        rss = min(r['rss_kb'] for r in runs)
+        print(f"{label:<24} {best * 1000:8.1f} ms  +{rss / 1024:6.1f} MB peak RSS  rows={runs[0]['rows']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Runs CscseFetcher against a local stand-in for the cscse endpoint that
+pages its listings (reporting "total"), adds a fixed latency and fails a
+fraction of requests with HTTP 503. Reports wall-clock time, requests,
+TCP connections opened, the most requests in flight at once, and checks
+no country came back truncated. A second pass revalidates every country
+with conditional requests, which the stand-in answers with 304 (pages
+carry an ETag).
+
+    python scripts/bench_cscse_fetcher.py --latency 0.05 --fail-rate 0.1 --max-rows 5000
+"""
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.cscse_fetcher import CscseFetcher
+from scripts.countries import COUNTRY_MAP
+
+
+def make_standin(latency, fail_rate, sizes):
+    stats = {'requests': 0, 'failures': 0, 'connections': set(), 'in_flight': 0, 'peak': 0}
+    lock = threading.Lock()
+    rng = random.Random(0)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            with lock:
+                stats['in_flight'] += 1
+                stats['peak'] = max(stats['peak'], stats['in_flight'])
+            time.sleep(latency)
+            with lock:
+                stats['in_flight'] -= 1
+                stats['requests'] += 1
+                stats['connections'].add(self.client_address)
+                fail = rng.random() < fail_rate
+                stats['failures'] += fail
+            if fail:
+                body = b'{}'
+                self.send_response(503)
+            else:
+                country = payload['country']
+                size = payload['pageSize']
+                first = (payload['currentPage'] - 1) * size
+                data = [{"CHINESE_NAME": f"{country}大学{i}", "ENGLISH_NAME": f"University {i}"}
+                        for i in range(first, min(sizes[country], first + size))]
+                body = json.dumps({"code": 200, "data": data, "total": sizes[country]},
+                                  ensure_ascii=False).encode('utf-8')
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    body = b''
+                    self.send_response(304)
+                else:
+                    self.send_response(200)
+                self.send_header('ETag', etag)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return ThreadingHTTPServer(('127.0.0.1', 0), Handler), stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--fail-rate', type=float, default=0.1)
+    parser.add_argument('--max-rows', type=int, default=3000)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 16])
+    args = parser.parse_args()
+
+    countries = [v for k, v in COUNTRY_MAP.items() if k != 'China']
+    rng = random.Random(1)
+    sizes = {c: rng.randint(0, args.max_rows) for c in countries}
+    for concurrency in args.concurrency:
+        server, stats = make_standin(args.latency, args.fail_rate, sizes)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        fetcher = CscseFetcher(url=f"http://127.0.0.1:{server.server_port}/",
+                               concurrency=concurrency, backoff=0.01)
+        start = time.perf_counter()
+        results = fetcher.fetch_all(countries, page_size=args.page_size)
+        elapsed = time.perf_counter() - start
+        complete = sum(1 for c, data in results.items() if len(data) == sizes[c])
+        print(f"concurrency={concurrency:>2}  {elapsed:6.2f}s  complete={complete}/{len(countries)}  "
+              f"rows={sum(len(d) for d in results.values())}  "
+              f"requests={stats['requests']} (503s={stats['failures']})  "
+              f"tcp connections={len(stats['connections'])}  peak in flight={stats['peak']}")
+
+        logs = {c: [] for c in countries}
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda c: sum(1 for _ in fetcher.iter_country(c, args.page_size, logs[c])), countries))
+        before = stats['requests']
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            unchanged = sum(pool.map(lambda c: fetcher.is_unchanged(c, logs[c], args.page_size), countries))
+        print(f"{'':15}revalidate {time.perf_counter() - start:6.2f}s  unchanged={unchanged}/{len(countries)}  "
+              f"requests={stats['requests'] - before}")
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Times DuplicateDetector on a synthetic master table with planted
+duplicates and planted homonyms, and reports how many duplicates it
+recovers, how many homonyms it wrongly merges, the precision of the
+merged pairs, and how many candidate pairs blocking produced against
+the all-pairs count.
+
+Duplicates are "The" / word order / accent variants in the same country,
+or a re-listing under another country whose Chinese name carries the
+original country ("美国..." listed under the UK). Homonyms are other
+institutions with the same name: the same name in another country, a
+state note (（俄亥俄州）) on one of two same-named rows, or a direction
+(北 / Northern) added to the name.
+
+    python scripts/bench_dedup.py --rows 300000 --duplicates 5000 --homonyms 5000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.dedup import DuplicateDetector
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'sha', 'tor', 'vel', 'an', 'bri', 'dun', 'es', 'gar', 'hol', 'is', 'jor',
+             'kel', 'lan', 'mor', 'nes', 'os', 'pra', 'quin', 'ros', 'sel', 'tan', 'ul', 'var', 'wes', 'yor', 'zan']
+# Common characters of transliterated place names
+HANZI = '阿巴贝比波布达德蒂杜厄法菲弗加戈格哈赫胡吉基卡凯科克库拉莱兰劳勒雷里利林卢鲁伦罗洛马麦曼梅蒙米莫姆纳内尼纽努诺欧帕佩皮普奇萨塞桑森瑟沙舍圣斯苏索塔泰特提托图瓦万威维温沃乌西希夏谢辛休雅亚伊因尤约扎泽詹'
+KINDS = [('大学', 'University of {}', '{} University'), ('学院', '{} College', '{} College'),
+         ('理工学院', '{} Institute of Technology', '{} Institute of Technology')]
+STATES = ['加利福尼亚州', '俄亥俄州', '佛罗里达州', '德克萨斯州', '明尼苏达州', '纽约州']
+COUNTRIES = [('美国', 'USA'), ('英国', 'UK'), ('法国', 'France'), ('巴西', 'Brazil'), ('印度', 'India'),
+             ('日本', 'Japan'), ('德国', 'Germany'), ('墨西哥', 'Mexico'), ('尼日利亚', 'Nigeria'), ('波兰', 'Poland')]
+
+
+def build_rows(n, duplicates, homonyms, seed=0):
+    """Returns (rows, {duplicate position: original position}, [homonym positions])."""
+    rng = random.Random(seed)
+    seen = set()
+    rows = []
+    while len(rows) < n - duplicates - homonyms:
+        place = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        hanzi = ''.join(rng.choice(HANZI) for _ in range(rng.randint(3, 5)))
+        if place in seen or hanzi in seen:
+            continue
+        seen.update((place, hanzi))
+        suffix, english, _ = rng.choice(KINDS)
+        country_chinese, country_english = rng.choice(COUNTRIES)
+        rows.append([hanzi + suffix, english.format(place), country_chinese, country_english])
+
+    planted = {}
+    picked = rng.sample(range(len(rows)), duplicates + homonyms)
+    for original in picked[:duplicates]:
+        chinese, english, country_chinese, country_english = rows[original]
+        kind = next(k for k in KINDS if chinese.endswith(k[0]))
+        place = english.replace('University of ', '').replace(' University', '')
+        for word in (' College', ' Institute of Technology'):
+            place = place.replace(word, '')
+        variant = rng.randrange(4)
+        if variant == 0:
+            english = 'The ' + english
+        elif variant == 1:
+            english = kind[2].format(place)
+        elif variant == 2:
+            english = english.replace(place, place.replace('a', 'á', 1))
+        else:
+            chinese = country_chinese + chinese
+            country_chinese, country_english = rng.choice([c for c in COUNTRIES if c[0] != country_chinese])
+        planted[len(rows)] = original
+        rows.append([chinese, english, country_chinese, country_english])
+
+    planted_homonyms = []
+    for original in picked[duplicates:]:
+        chinese, english, country_chinese, country_english = rows[original]
+        variant = rng.randrange(3)
+        if variant == 0:
+            country_chinese, country_english = rng.choice([c for c in COUNTRIES if c[0] != country_chinese])
+        elif variant == 1:
+            chinese = chinese + '（' + rng.choice(STATES) + '）'
+        else:
+            chinese, english = '北' + chinese, 'Northern ' + english
+        planted_homonyms.append(len(rows))
+        rows.append([chinese, english, country_chinese, country_english])
+    return rows, planted, planted_homonyms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=300000)
+    parser.add_argument('--duplicates', type=int, default=5000)
+    parser.add_argument('--homonyms', type=int, default=5000)
+    args = parser.parse_args()
+
+    rows, planted, homonyms = build_rows(args.rows, args.duplicates, args.homonyms)
+    detector = DuplicateDetector()
+
+    start = time.perf_counter()
+    pairs = detector.candidate_pairs(rows)
+    blocking = time.perf_counter() - start
+    start = time.perf_counter()
+    clusters = detector.clusters(rows)
+    elapsed = time.perf_counter() - start
+
+    cluster_of = {pos: n for n, cluster in enumerate(clusters) for pos in cluster}
+    found = sum(1 for dup, original in planted.items()
+                if dup in cluster_of and cluster_of.get(original) == cluster_of[dup])
+    merged_homonyms = sum(1 for pos in homonyms if pos in cluster_of)
+    # A merged pair is right when both rows are one planted original or its re-listings
+    right = merged = 0
+    for cluster in clusters:
+        for a in range(len(cluster)):
+            for b in range(a + 1, len(cluster)):
+                merged += 1
+                right += planted.get(cluster[a], cluster[a]) == planted.get(cluster[b], cluster[b])
+    precision = right / merged if merged else 1.0
+
+    all_pairs = len(rows) * (len(rows) - 1) // 2
+    print(f"{len(rows)} rows, {len(planted)} planted duplicates, {len(homonyms)} planted homonyms")
+    print(f"candidate pairs {len(pairs)} of {all_pairs} ({len(pairs) / all_pairs:.2e}), blocking {blocking:.2f}s")
+    print(f"clusters {len(clusters)} in {elapsed:.2f}s; recovered {found}/{len(planted)}, "
+          f"homonyms merged {merged_homonyms}/{len(homonyms)}, pair precision {precision:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares the original per-keyword is_valid_english loop with
+EnglishNameValidator (scalar and vectorized) over world_universities.csv,
+and checks that all three agree on every row.
+
+    python scripts/bench_english_validator.py
+"""
+import os
+import re
+import sys
+import time
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.english_validator import BAD_KEYWORDS, EnglishNameValidator
+
+
+def legacy_is_valid_english(text):
+    # The implementation EnglishNameValidator replaced, kept as the reference
+    if pd.isna(text) or str(text).strip() == "" or str(text).lower() == "nan":
+        return False
+    text_str = str(text)
+    try:
+        text_str.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    text_lower = text_str.lower()
+    for kw in BAD_KEYWORDS:
+        pattern = r'(^|\s|[^a-z0-9])' + re.escape(kw) + r'($|\s|[^a-z0-9])'
+        if re.search(pattern, text_lower):
+            return False
+    return True
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  ({rows / elapsed:,.0f} names/s)")
+    return result, elapsed
+
+
+def main():
+    df = pd.read_csv(os.path.join(ROOT, 'world_universities.csv'), encoding='utf-8-sig')
+    # Mix in the Chinese names as well so the non-ASCII path is exercised
+    names = pd.concat([df['english_name'], df['chinese_name']], ignore_index=True)
+    validator = EnglishNameValidator()
+
+    legacy, t_legacy = timed("legacy loop", lambda: [legacy_is_valid_english(n) for n in names], len(names))
+    scalar, t_scalar = timed("validator.is_valid", lambda: [validator.is_valid(n) for n in names], len(names))
+    vector, t_vector = timed("validator.validate_series", lambda: validator.validate_series(names), len(names))
+
+    assert legacy == scalar == vector.tolist(), "validator results differ from the legacy implementation"
+    print(f"identical results on {len(names)} names; "
+          f"speedup scalar={t_legacy / t_scalar:.1f}x vectorized={t_legacy / t_vector:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Times FuzzyUniversityIndex against a difflib linear scan on misspelled,
+accented and Traditional-script queries drawn from world_universities.csv.
+
+    python scripts/bench_fuzzy_index.py --queries 500
+"""
+import os
+import sys
+import time
+import random
+import difflib
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.fuzzy_index import FuzzyUniversityIndex
+
+# A few Simplified -> Traditional swaps common in university names
+TRADITIONAL = str.maketrans({'学': '學', '国': '國', '华': '華', '东': '東', '师': '師', '范': '範',
+                             '农': '農', '业': '業', '医': '醫', '药': '藥', '艺': '藝', '术': '術'})
+
+
+def typo(text, rng):
+    if len(text) < 4:
+        return text
+    i = rng.randrange(len(text) - 1)
+    op = rng.random()
+    if op < 0.33:
+        return text[:i] + text[i + 1:]
+    if op < 0.66:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    return text[:i] + rng.choice('aeiou') + text[i + 1:]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'world_universities.csv'))
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = FuzzyUniversityIndex.from_csv(args.csv)
+    print(f"built index over {len(index.records)} records in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(0)
+    sample = rng.sample(index.records, args.queries)
+    queries = []
+    for record in sample:
+        queries.append((typo(record['english_name'], rng), record['_id']))
+        queries.append((record['chinese_name'].translate(TRADITIONAL), record['_id']))
+
+    hits = 0
+    start = time.perf_counter()
+    for query, expected in queries:
+        results = index.search(query, k=5)
+        hits += any(r['_id'] == expected for r in results)
+    elapsed = time.perf_counter() - start
+    print(f"index:   {elapsed / len(queries) * 1000:.3f} ms/query, recall@5 = {hits / len(queries):.1%}")
+
+    english_names = [r['english_name'] for r in index.records]
+    subset = [q for q in queries[::2]][:50]
+    start = time.perf_counter()
+    for query, _ in subset:
+        difflib.get_close_matches(query, english_names, n=5, cutoff=0.6)
+    elapsed = time.perf_counter() - start
+    print(f"difflib: {elapsed / len(subset) * 1000:.3f} ms/query (English only, {len(subset)} queries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Times the missing-name write-back of update_china_missing_names.py on a
+synthetic China list: the old per-name `df.loc[df['chinese_name'] == name]`
+scan plus a full re-count after every batch, against MissingNameTable.
+
+    python scripts/bench_missing_names.py --rows 100000 --missing 2000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.dataset import import_pandas
+from scripts.missing_names import MissingNameTable
+
+CHARS = '北京上海南开复旦浙江武汉中山华东师范理工农业医科大学院职业技术财经政法交通航空'
+
+
+def build_frame(rows, missing, seed=0):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < rows:
+        names.add(''.join(rng.choice(CHARS) for _ in range(rng.randint(4, 10))) + '大学')
+    names = sorted(names)
+    english = [f"University {i}" for i in range(rows)]
+    for i in rng.sample(range(rows), missing):
+        english[i] = None
+    return import_pandas().DataFrame({'chinese_name': names, 'english_name': english})
+
+
+def batches(df, batch_size):
+    todo = df.loc[df['english_name'].isna(), 'chinese_name'].tolist()
+    for i in range(0, len(todo), batch_size):
+        yield {cname: f"EN {cname}" for cname in todo[i:i + batch_size]}
+
+
+def scan(df, batch_size):
+    for results in batches(df, batch_size):
+        for cname, ename in results.items():
+            df.loc[df['chinese_name'] == cname, 'english_name'] = ename
+        remaining = len(df[df['english_name'].isna() | (df['english_name'].astype(str).str.strip() == '')])
+    return df, remaining
+
+
+def indexed(df, batch_size):
+    table = MissingNameTable(df)
+    for results in batches(df, batch_size):
+        table.update(results)
+    return table.frame(), table.missing
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--missing', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=50)
+    args = parser.parse_args()
+
+    base = build_frame(args.rows, args.missing)
+    print(f"{args.rows} rows, {args.missing} missing, batches of {args.batch_size}")
+    results = {}
+    for label, fn in (('scan', scan), ('indexed', indexed)):
+        start = time.perf_counter()
+        df, remaining = fn(base.copy(), args.batch_size)
+        elapsed = time.perf_counter() - start
+        results[label] = df
+        print(f"{label:8} {elapsed:8.3f}s  remaining {remaining}")
+    same = results['scan']['english_name'].astype(object).equals(results['indexed']['english_name'].astype(object))
+    print(f"identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Measures main.py startup with `python -X importtime`: the cost of
+importing main itself (what `main.py summarize` pays before doing any
+work) against also loading the dependencies the other stages import
+lazily (pandas, the Gemini SDK, dotenv).
+
+    python scripts/bench_startup.py --repeat 5
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ('import main', "import main"),
+    ('+ stage dependencies', "import main, pandas, dotenv, google.generativeai"),
+]
+
+
+def importtime(code):
+    """Returns ({top-level module: cumulative microseconds}, total microseconds)."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    top = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level imports are indented by a single space
+        if not name.startswith('  '):
+            top[name.strip()] = int(cumulative)
+    return top, sum(top.values())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+
+    for label, code in CASES:
+        runs = [importtime(code) for _ in range(args.repeat)]
+        top, total = min(runs, key=lambda r: r[1])
+        print(f"{label:22} {total / 1000:8.1f} ms")
+        for name, us in sorted(top.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"    {name:36} {us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
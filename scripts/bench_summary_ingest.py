@@ -0,0 +1,67 @@
+"""
+Builds a synthetic data/ tree with many country folders and times a full
+(non-incremental) generate_global_summary for several process-pool sizes,
+then an incremental re-run and a single-file change.
+
+    python scripts/bench_summary_ingest.py --countries 2000 --rows 50
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import contextlib
+import io
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from main import UniversityProjectManager
+
+
+def build_tree(root, countries, rows):
+    for c in range(countries):
+        country_dir = os.path.join(root, 'data', f"Country {c:05d}")
+        os.makedirs(country_dir)
+        with open(os.path.join(country_dir, f"country_{c:05d}_universities.csv"), 'w', encoding='utf-8-sig') as f:
+            f.write("chinese_name,english_name\n")
+            for r in range(rows):
+                f.write(f"第{c}国第{r}大学,\"University {r}, Campus {c}\"\n")
+
+
+def run(manager, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.generate_global_summary(**kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--countries', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=50)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='bench_summary_')
+    try:
+        build_tree(root, args.countries, args.rows)
+        manager = UniversityProjectManager(project_root=root, translator=object())
+        print(f"{args.countries} files x {args.rows} rows, {os.cpu_count()} CPUs")
+
+        baseline = None
+        for workers in args.workers:
+            elapsed = run(manager, incremental=False, workers=workers)
+            baseline = baseline or elapsed
+            print(f"full rebuild  workers={workers:>2}  {elapsed:7.3f}s  speedup={baseline / elapsed:5.2f}x")
+
+        print(f"no-op rerun              {run(manager):7.3f}s")
+        with open(os.path.join(root, 'data', 'Country 00000', 'country_00000_universities.csv'), 'a', encoding='utf-8') as f:
+            f.write("新大学,New University\n")
+        print(f"one file changed         {run(manager):7.3f}s")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
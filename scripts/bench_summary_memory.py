@@ -0,0 +1,69 @@
+"""
+Compares peak memory (max RSS) and time of the sorted summary build
+against the streaming one on a synthetic data/ tree. Each build runs in
+its own process so the peaks don't mix.
+
+    python scripts/bench_summary_memory.py --countries 200 --rows 5000
+"""
+import os
+import sys
+import time
+import shutil
+import resource
+import tempfile
+import argparse
+import subprocess
+import contextlib
+import io
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.bench_summary_ingest import build_tree
+
+
+def child(root, mode, memory_mb):
+    from main import UniversityProjectManager
+    manager = UniversityProjectManager(project_root=root, translator=object())
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'stream':
+            manager.stream_global_summary(memory_budget_mb=memory_mb)
+        else:
+            manager.generate_global_summary(incremental=False)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    print(f"{elapsed:.3f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--countries', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--memory-mb', type=int, default=16)
+    parser.add_argument('--child', nargs=2, metavar=('ROOT', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], args.child[1], args.memory_mb)
+        return
+
+    root = tempfile.mkdtemp(prefix='bench_summary_memory_')
+    try:
+        build_tree(root, args.countries, args.rows)
+        print(f"{args.countries} files x {args.rows} rows")
+        outputs = {}
+        for mode in ('sorted', 'stream'):
+            proc = subprocess.run([sys.executable, '-W', 'ignore', __file__, '--child', root, mode,
+                                   '--memory-mb', str(args.memory_mb)],
+                                  capture_output=True, text=True, check=True)
+            elapsed, peak = proc.stdout.split()[-2:]
+            with open(os.path.join(root, 'world_universities.csv'), 'rb') as f:
+                outputs[mode] = f.read()
+            print(f"{mode:7} {float(elapsed):7.2f}s  peak RSS {float(peak):8.1f} MB")
+        print(f"output size {len(outputs['stream']) / 1e6:.1f} MB, identical: {outputs['sorted'] == outputs['stream']}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Checks the local rule-based backend against CASES (names the translate
+stage selects from data/, with the answer it must give, None meaning
+"leave it for the remote backend"), then measures how much of a bulk
+run it takes off the remote model. The gemini-only and tiered setups
+run over the names under data/ that fail the English check (what the
+translate stage would send) and, separately, a synthetic set of
+Romance/German institution names, with a local fake model standing in
+for Gemini (fixed latency per request, scaled down by --time-scale;
+times are reported unscaled).
+
+    python scripts/bench_translation_backends.py --synthetic 2000 --request-latency 2
+"""
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import random
+import argparse
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from main import GeminiTranslator, pack_batches
+from scripts.english_validator import EnglishNameValidator
+from scripts.translation_backends import RuleBasedBackend, TieredTranslator
+
+TEMPLATES = [
+    "Universidad Nacional de {place}", "Universidad de {place}", "Universidad Autónoma de {place}",
+    "Universidad Tecnológica de {place}", "Universidade Federal de {place}", "Universidade Estadual de {place}",
+    "Università degli Studi di {place}", "Politecnico di {place}", "Université de {place}",
+    "École Nationale Supérieure de {place}", "Technische Universität {place}", "Universität {place}",
+    "Hochschule {place}", "Instituto Tecnológico de {place}",
+]
+# Names selected from data/ and the answer the rules must give
+CASES = [
+    ("École Polytechnique", None),
+    ("École Centrale Paris", None),
+    ("École Normale Supérieure", None),
+    ("École Normale Supérieure de Lyon", None),
+    ("Accademia del Lusso", None),
+    ("Royal Conservatoire of Scotland", None),
+    ("Trinity Laban Conservatoire of Music and Dance", None),
+    ("Institut Mines-Télécom Business School", "Institut Mines-Telecom Business School"),
+    ("Universität Hamburg", None),
+    ("Escuela Superior de Guerra", None),
+    ("Universidade Federal do Rio de Janeiro", None),
+    ("Institut d'Études Politiques de Paris", None),
+    ("University of Côte d'Azur", "University of Cote d'Azur"),
+    ("Poznań University of Economics and Business", "Poznan University of Economics and Business"),
+    ("Universidad Nacional Autónoma de México", "National Autonomous University of Mexico"),
+    ("Pontificia Universidad Católica de Chile", "Pontifical Catholic University of Chile"),
+    ("Université d'Orléans", "University of Orleans"),
+    ("Universidad de Santiago de Chile", "University of Santiago de Chile"),
+]
+PLACES = ["Salamanca", "Córdoba", "São Paulo", "Minas Gerais", "Bologna", "Torino", "Lyon", "Rennes",
+          "Hamburg", "Dresden", "Mendoza", "Cuyo", "Pernambuco", "Napoli", "Brest", "Bremen", "Morelos"]
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self, request_latency, time_scale):
+        self.request_latency = request_latency
+        self.time_scale = time_scale
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.names = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        data = json.loads(prompt.split('Data: ', 1)[1])
+        with self.lock:
+            self.requests += 1
+            self.names += len(data)
+        time.sleep(self.request_latency * self.time_scale)
+        return FakeResponse(json.dumps([{'chinese_name': d['chinese_name'], 'english_name': "University of X"}
+                                        for d in data], ensure_ascii=False))
+
+
+def load_invalid():
+    """{country: [entries]} for names under data/ that fail the English check."""
+    validator = EnglishNameValidator()
+    entries = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, 'data', '*', '*_universities.csv'))):
+        country = os.path.basename(os.path.dirname(path))
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                name = row.get('english_name') or ''
+                if row.get('chinese_name') and not validator.is_valid(name):
+                    entries.setdefault(country, []).append({'chinese_name': row['chinese_name'],
+                                                            'original_name': name})
+    return entries
+
+
+def synthetic(count, seed=0):
+    rng = random.Random(seed)
+    return [{'chinese_name': f"大学{i}", 'original_name': rng.choice(TEMPLATES).format(place=rng.choice(PLACES))}
+            for i in range(count)]
+
+
+def check_cases(rules):
+    """Prints every case the rules get wrong; returns the number right."""
+    right = 0
+    for name, expected in CASES:
+        got = rules.translate_name(name)
+        if got == expected:
+            right += 1
+        else:
+            print(f"  WRONG {name!r} -> {got!r} (expected {expected!r})")
+    return right
+
+
+def run(label, rules, entries, args):
+    model = FakeModel(args.request_latency, args.time_scale)
+    remote = GeminiTranslator.__new__(GeminiTranslator)
+    remote.cache = None
+    remote.model = model
+    translator = remote if label == 'gemini' else TieredTranslator(rules, remote)
+    start = time.perf_counter()
+    local = 0
+    for country, rows in entries.items():
+        # As translate_missing_or_bad_names does: only the local
+        # backend's residue is packed into requests
+        if label == 'tiered':
+            done, rows = translator.split(rows, country)
+            local += len(done)
+        for batch in pack_batches(rows, country, token_budget=args.token_budget):
+            translator.translate_university_names(batch, country)
+    elapsed = time.perf_counter() - start - model.requests * args.request_latency * args.time_scale
+    print(f"  {label:7} local {local:5}  remote names {model.names:5}  requests {model.requests:3}  "
+          f"modelled remote time {model.requests * args.request_latency:6.1f}s  other time {elapsed:5.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--synthetic', type=int, default=2000, help="synthetic Romance/German names to add")
+    parser.add_argument('--token-budget', type=int, default=4000)
+    parser.add_argument('--request-latency', type=float, default=2.0, help="seconds per remote request")
+    parser.add_argument('--time-scale', type=float, default=0.001, help="fraction of the modelled latency to sleep")
+    parser.add_argument('--show', type=int, default=8, help="sample local translations from data/ to print")
+    args = parser.parse_args()
+
+    rules = RuleBasedBackend()
+    print(f"cases: {check_cases(rules)}/{len(CASES)} right")
+
+    real = load_invalid()
+    sets = [(f"data/: {sum(len(rows) for rows in real.values())} names failing the English check", real)]
+    if args.synthetic:
+        sets.append((f"synthetic: {args.synthetic} names", {'Synthetic': synthetic(args.synthetic)}))
+    for title, entries in sets:
+        print(title)
+        for label in ('gemini', 'tiered'):
+            run(label, rules, entries, args)
+
+    samples = [row['original_name'] for rows in real.values() for row in rows]
+    random.Random(1).shuffle(samples)
+    shown = 0
+    for name in samples:
+        english = rules.translate_name(name)
+        if english and english != name and shown < args.show:
+            print(f"  {name} -> {english}")
+            shown += 1
+
+
+if __name__ == "__main__":
+    main()
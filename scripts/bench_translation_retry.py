@@ -0,0 +1,106 @@
+"""
+Runs GeminiTranslator's retry layer against a local fault-injecting fake
+model: replies are randomly rate-limited (a 429 error), malformed
+(truncated JSON) or missing some of the names. Compares one request
+per batch (how failures were handled before: the batch, or the dropped
+names, were lost until the next run) with _translate_batch, and checks
+that every name comes back with its own translation.
+
+    python scripts/bench_translation_retry.py --names 5000 --batch-size 50 --fault-rate 0.1
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import GeminiTranslator
+
+
+class ResourceExhausted(Exception):
+    """Stand-in for google.api_core.exceptions.ResourceExhausted."""
+    code = 429
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FlakyModel:
+    def __init__(self, rate_limit, malformed, drop, seed=0):
+        self.rate_limit = rate_limit
+        self.malformed = malformed
+        self.drop = drop
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.names_sent = 0
+        self.faults = {'rate_limit': 0, 'malformed': 0, 'dropped': 0}
+
+    def generate_content(self, prompt, generation_config=None):
+        data = json.loads(prompt.split('Data: ', 1)[1])
+        with self.lock:
+            self.calls += 1
+            self.names_sent += len(data)
+            roll = self.rng.random()
+            if roll < self.rate_limit:
+                self.faults['rate_limit'] += 1
+                raise ResourceExhausted("429 Resource has been exhausted (e.g. check quota).")
+            reply = [{'chinese_name': d['chinese_name'], 'english_name': f"University of {d['original_name']}"}
+                     for d in data]
+            text = json.dumps(reply, ensure_ascii=False)
+            if roll < self.rate_limit + self.malformed:
+                self.faults['malformed'] += 1
+                return FakeResponse(text[:self.rng.randrange(1, len(text))])
+            kept = [item for item in reply if self.rng.random() >= self.drop]
+            self.faults['dropped'] += len(reply) - len(kept)
+        return FakeResponse(json.dumps(kept, ensure_ascii=False))
+
+
+def make_translator(model, backoff, attempts):
+    translator = GeminiTranslator.__new__(GeminiTranslator)
+    translator.cache = None
+    translator.model = model
+    translator.BACKOFF_BASE = backoff
+    translator.MAX_ATTEMPTS = attempts
+    return translator
+
+
+def single_request(translator, batch):
+    """One request per batch and no retries."""
+    try:
+        return translator._request_translations(batch, "Poland", None)[0]
+    except Exception:
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--names', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--fault-rate', type=float, default=0.1,
+                        help="probability of each fault: rate limit, malformed reply, dropped name")
+    parser.add_argument('--backoff', type=float, default=0.001, help="backoff base in seconds")
+    args = parser.parse_args()
+
+    names = [{'chinese_name': f"大学{i}", 'original_name': f"Uczelnia {i}"} for i in range(args.names)]
+    batches = [names[i:i + args.batch_size] for i in range(0, len(names), args.batch_size)]
+    rate = args.fault_rate
+    print(f"{args.names} names in batches of {args.batch_size}, fault rate {rate}")
+
+    retry = lambda t, b: t._translate_batch(b, "Poland", None)[0]
+    for label, run, attempts in (('single', single_request, 1), ('retry', retry, GeminiTranslator.MAX_ATTEMPTS)):
+        model = FlakyModel(rate, rate, rate)
+        translator = make_translator(model, args.backoff, attempts)
+        results = [item for batch in batches for item in run(translator, batch)]
+        correct = sum(1 for item in results
+                      if item['english_name'] == f"University of Uczelnia {item['chinese_name'][2:]}")
+        print(f"{label:7} translated {len(results):5}/{args.names} (correct {correct})  calls {model.calls:4}  "
+              f"names sent per name {model.names_sent / args.names:.2f}  faults {model.faults}")
+
+
+if __name__ == "__main__":
+    main()
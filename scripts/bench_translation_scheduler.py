@@ -0,0 +1,50 @@
+"""
+Measures TranslationScheduler wall-clock time against a fake model that
+sleeps for a fixed latency per request, for increasing concurrency caps.
+
+    python scripts/bench_translation_scheduler.py --batches 64 --latency 0.05
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.translation_scheduler import TranslationScheduler
+
+
+class FakeTranslator:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def translate_university_names(self, universities, country="Poland", language=None):
+        time.sleep(self.latency)
+        return [{"chinese_name": u["chinese_name"], "english_name": f"University {u['chinese_name']}"}
+                for u in universities]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--batches', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    jobs = []
+    for b in range(args.batches):
+        batch = [{"chinese_name": f"{b}-{i}", "original_name": ""} for i in range(args.batch_size)]
+        jobs.append((f"country_{b % 8}", batch, f"Country {b % 8}", None))
+
+    translator = FakeTranslator(args.latency)
+    baseline = None
+    for concurrency in (1, 2, 4, 8, 16):
+        start = time.perf_counter()
+        results = TranslationScheduler(translator, concurrency=concurrency).run(jobs)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        total = sum(len(v) for v in results.values())
+        print(f"concurrency={concurrency:>2}  {elapsed:6.3f}s  speedup={baseline / elapsed:5.2f}x  items={total}")
+
+
+if __name__ == "__main__":
+    main()
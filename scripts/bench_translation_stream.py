@@ -0,0 +1,92 @@
+"""
+Time to first result of a translation batch with and without streaming,
+against a local fake model that writes its reply at a fixed rate of
+characters per second: streamed, it hands out the reply in small chunks
+as they are "generated"; otherwise it returns the whole reply at the end.
+A third run cuts the stream off halfway to check that the rest of the
+batch is recovered through the regular retry path.
+
+    python scripts/bench_translation_stream.py --names 200 --chars-per-second 4000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import GeminiTranslator
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class StreamingModel:
+    def __init__(self, chars_per_second, chunk_chars=64, cut_at=None):
+        self.chars_per_second = chars_per_second
+        self.chunk_chars = chunk_chars
+        self.cut_at = cut_at
+        self.calls = 0
+
+    def _reply(self, prompt):
+        data = json.loads(prompt.split('Data: ', 1)[1])
+        return json.dumps([{'chinese_name': d['chinese_name'], 'english_name': f"University of {d['original_name']}"}
+                           for d in data], ensure_ascii=False, indent=1)
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        reply = self._reply(prompt)
+        if not stream:
+            time.sleep(len(reply) / self.chars_per_second)
+            return FakeChunk(reply)
+        return self._chunks(reply, cut=self.cut_at if self.calls == 1 else None)
+
+    def _chunks(self, reply, cut):
+        for start in range(0, len(reply), self.chunk_chars):
+            if cut is not None and start >= len(reply) * cut:
+                raise ConnectionError("stream reset by peer")
+            chunk = reply[start:start + self.chunk_chars]
+            time.sleep(len(chunk) / self.chars_per_second)
+            yield FakeChunk(chunk)
+
+
+def run(translator, batch, stream):
+    start = time.perf_counter()
+    first = None
+    items = []
+    if stream:
+        for item in translator.stream_university_names(batch):
+            first = first or time.perf_counter() - start
+            items.append(item)
+    else:
+        items = translator.translate_university_names(batch)
+        first = time.perf_counter() - start
+    return first, time.perf_counter() - start, items
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--names', type=int, default=200)
+    parser.add_argument('--chars-per-second', type=float, default=4000)
+    args = parser.parse_args()
+
+    # Both paths import the Gemini SDK on first use; don't time that
+    import google.generativeai
+
+    batch = [{'chinese_name': f"大学{i}", 'original_name': f"Uczelnia {i}"} for i in range(args.names)]
+    print(f"{args.names} names, reply written at {args.chars_per_second:.0f} chars/s")
+    for label, stream, cut in (('whole', False, None), ('stream', True, None), ('cut 50%', True, 0.5)):
+        model = StreamingModel(args.chars_per_second, cut_at=cut)
+        translator = GeminiTranslator.__new__(GeminiTranslator)
+        translator.cache = None
+        translator.model = model
+        first, total, items = run(translator, batch, stream)
+        correct = sum(1 for item in items if item['english_name'] == f"University of Uczelnia {item['chinese_name'][2:]}")
+        print(f"{label:8} first result {first:6.3f}s  all {total:6.3f}s  items {len(items)} (correct {correct}, "
+              f"distinct {len({item['chinese_name'] for item in items})})  calls {model.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Load-tests the lookup server: starts it in-process on a free port, then
+drives it from several keep-alive client threads with a mix of id,
+Chinese-name, English-name and country requests. Reports requests/s and
+latency percentiles, plus raw in-process index lookup speed.
+
+    python scripts/bench_university_server.py --clients 8 --requests 2000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+import http.client
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.university_index import UniversityIndex
+from scripts.university_server import make_server
+
+
+def request_paths(index, count, seed):
+    rng = random.Random(seed)
+    countries = index.countries()
+    paths = []
+    for _ in range(count):
+        record = rng.choice(index.records)
+        kind = rng.random()
+        if kind < 0.4:
+            paths.append(f"/universities/{record['_id']}")
+        elif kind < 0.7:
+            paths.append(f"/lookup?chinese={quote(record['chinese_name'])}")
+        elif kind < 0.95:
+            paths.append(f"/lookup?english={quote(record['english_name'])}")
+        else:
+            paths.append(f"/countries/{quote(rng.choice(countries))}")
+    return paths
+
+
+def client(port, paths, latencies):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    for path in paths:
+        start = time.perf_counter()
+        conn.request('GET', path)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'world_universities.csv'))
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per client')
+    args = parser.parse_args()
+
+    index = UniversityIndex.from_csv(args.csv)
+
+    start = time.perf_counter()
+    for record in index.records:
+        index.get(record['_id'])
+        index.lookup_chinese(record['chinese_name'])
+        index.lookup_english(record['english_name'])
+    elapsed = time.perf_counter() - start
+    print(f"in-process: {3 * len(index) / elapsed:,.0f} lookups/s over {len(index)} records")
+
+    server = make_server(index, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    latencies = []
+    workers = [
+        threading.Thread(target=client, args=(server.server_port, request_paths(index, args.requests, seed), latencies))
+        for seed in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    print(f"http: {len(latencies)} requests from {args.clients} clients in {elapsed:.2f}s "
+          f"= {len(latencies) / elapsed:,.0f} req/s; "
+          f"p50={percentile(latencies, 0.5) * 1000:.2f} ms "
+          f"p99={percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Times wikitable name extraction on a large province-style page: the old
+BeautifulSoup(html.parser) + find_all/get_text loop against
+scripts/wikitable.py (lxml). Uses a generated page unless --html points
+at a saved one (e.g. from .wiki_cache/).
+
+    python scripts/bench_wikitable.py --rows 5000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.wikitable import iter_name_rows
+
+CITIES = ['Beijing', 'Haidian', 'Chaoyang', 'Changping', 'Fengtai']
+
+
+def make_page(rows, tables=4):
+    rng = random.Random(0)
+    parts = ['<html><body><div class="mw-parser-output">']
+    per_table = rows // tables
+    n = 0
+    for _ in range(tables):
+        parts.append('<table class="wikitable sortable"><tbody><tr><th>No.</th><th>Name</th>'
+                     '<th>Chinese name</th><th>City</th><th>Type</th><th>Notes</th></tr>')
+        i = 0
+        while i < per_table:
+            span = rng.choice([1, 1, 1, 2, 3])
+            for j in range(span):
+                n += 1
+                city = f'<td rowspan="{span}"><a href="/wiki/{CITIES[n % 5]}">{CITIES[n % 5]}</a></td>' if j == 0 else ''
+                parts.append(
+                    f'<tr><td>{n}</td><td><a href="/wiki/U{n}">University of Somewhere No. {n}</a>'
+                    f'<sup class="reference"><a href="#cite-{n}">[{n % 9 + 1}]</a></sup></td>'
+                    f'<td lang="zh">某某大学{n}</td>{city}<td>Public</td>'
+                    f'<td>Founded in {1900 + n % 120}; <i>project 211</i></td></tr>')
+            i += span
+        parts.append('</tbody></table>')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+def bs4_names(html):
+    """The previous per-script extraction loop."""
+    soup = BeautifulSoup(html, 'html.parser')
+    names = []
+    for table in soup.find_all('table', {'class': 'wikitable'}):
+        header_row = table.find('tr')
+        headers_text = [h.get_text().strip().lower() for h in header_row.find_all(['th', 'td'])]
+        eng_idx = chi_idx = -1
+        for i, h in enumerate(headers_text):
+            if 'chinese' in h:
+                chi_idx = i
+            elif 'name' in h or h == 'school' or h == 'institution':
+                eng_idx = i
+        if eng_idx == -1 or chi_idx == -1:
+            continue
+        for row in table.find_all('tr')[1:]:
+            cols = row.find_all(['td', 'th'])
+            if len(cols) > max(eng_idx, chi_idx):
+                names.append((cols[eng_idx].get_text().strip(), cols[chi_idx].get_text().strip()))
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--html', help="saved page to parse instead of a generated one")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.html:
+        with open(args.html, 'r', encoding='utf-8') as f:
+            html = f.read()
+    else:
+        html = make_page(args.rows)
+    print(f"page: {len(html) / 1e6:.1f} MB")
+
+    for label, extract in (('bs4 html.parser', bs4_names), ('wikitable (lxml)', lambda h: list(iter_name_rows(h)))):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            names = extract(html)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:18} {best * 1000:8.1f} ms  rows={len(names)}")
+
+
+if __name__ == "__main__":
+    main()
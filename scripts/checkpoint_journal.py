@@ -0,0 +1,102 @@
+"""
+Write-ahead checkpointing for the long-running per-batch translation
+scripts. Each finished batch is appended to <csv>.wal as one JSON line
+(flushed and fsynced), instead of rewriting the whole CSV every time.
+The CSV itself is only rewritten, atomically, at the end and once at
+least `compact_every` batches and half a table's worth of names have
+been logged since the last rewrite (which keeps total I/O linear in the
+number of names); a resumed run replays the log on top of it.
+
+A crash can at worst leave a half-written last log line, which replay
+cuts off, and a replayed batch that was already compacted is simply
+applied again.
+"""
+import os
+import csv
+import json
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_file(path, mode='w', **open_kwargs):
+    """
+    Opens a temp file next to `path`; on a clean exit it is fsynced and
+    renamed over `path`, on an exception it is removed and `path` is left
+    untouched.
+    """
+    tmp_path = path + '.tmp'
+    f = open(tmp_path, mode, **open_kwargs)
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+    except BaseException:
+        f.close()
+        os.remove(tmp_path)
+        raise
+    f.close()
+    os.replace(tmp_path, path)
+
+
+def atomic_write_csv(path, header, rows):
+    with atomic_file(path, encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+class CheckpointJournal:
+    def __init__(self, path, compact_every=10):
+        self.path = path
+        self.compact_every = max(1, int(compact_every))
+        self.pending = 0 # batches logged since the last compaction
+        self.logged = 0 # names logged since the last compaction
+
+    def replay(self):
+        """{chinese_name: english_name} from every complete logged batch, in order."""
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            # Torn write from an interrupted run: cut it off so the next
+            # append starts on a fresh line
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+        for line in data[:end].decode('utf-8').splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            entries.update(record.get('entries', []))
+            self.pending += 1
+            self.logged += len(record.get('entries', []))
+        return entries
+
+    def append(self, entries, table_size=0):
+        """
+        Logs one batch ({chinese_name: english_name}). Returns True when
+        it's time to compact a table of `table_size` rows.
+        """
+        if entries:
+            line = json.dumps({'entries': list(entries.items())}, ensure_ascii=False)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending += 1
+            self.logged += len(entries)
+        return self.pending >= self.compact_every and self.logged * 2 >= table_size
+
+    def compact(self, write):
+        """
+        Calls write() to rewrite the CSV (atomically, e.g. with
+        atomic_write_csv), then drops the log it now contains.
+        """
+        write()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.pending = 0
+        self.logged = 0
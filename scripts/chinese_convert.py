@@ -0,0 +1,150 @@
+"""
+Traditional -> Simplified conversion shared by the scrapers, the fuzzy
+index and the summary.
+
+OpenCC('t2s') is loaded once, on first use. Strings with no character
+that t2s could change are returned without calling OpenCC at all; the
+rest are memoized in an LRU. Lists and Series are converted in one
+OpenCC call by joining the uncached names with a newline sentinel.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+# Never part of a name, and OpenCC leaves it alone
+SENTINEL = '\n'
+
+
+class SimplifiedConverter:
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self._cc = None
+        self._triggers = None
+
+    def _load(self):
+        with self.lock:
+            if self._cc is None:
+                try:
+                    from opencc import OpenCC
+                    self._cc = OpenCC('t2s')
+                    self._triggers = _trigger_chars()
+                except ImportError:
+                    print("opencc not installed; Chinese names are kept as written.")
+                    self._cc = False
+        return self._cc
+
+    def is_simplified(self, text):
+        """
+        Fast path: True if no character in `text` appears in the t2s
+        dictionaries. Only available when the dictionary files can be read;
+        otherwise every CJK string goes through OpenCC.
+        """
+        if text.isascii():
+            return True
+        if self._triggers is None:
+            return False
+        return self._triggers.isdisjoint(text)
+
+    def _remember(self, text, result):
+        with self.lock:
+            self.cache[text] = result
+            if len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+
+    def _lookup(self, text):
+        with self.lock:
+            result = self.cache.get(text)
+            if result is not None:
+                self.cache.move_to_end(text)
+            return result
+
+    def convert(self, text):
+        if not text or not self._load() or self.is_simplified(text):
+            return text
+        result = self._lookup(text)
+        if result is None:
+            result = self._cc.convert(text)
+            self._remember(text, result)
+        return result
+
+    def convert_many(self, texts):
+        """Converts a list of strings with at most one OpenCC call."""
+        texts = list(texts)
+        if not texts or not self._load():
+            return texts
+        results = {}
+        pending = []
+        for text in set(texts):
+            if not text or self.is_simplified(text):
+                results[text] = text
+                continue
+            cached = self._lookup(text)
+            if cached is None:
+                pending.append(text)
+            else:
+                results[text] = cached
+        if pending:
+            if any(SENTINEL in text for text in pending):
+                converted = [self._cc.convert(text) for text in pending]
+            else:
+                converted = self._cc.convert(SENTINEL.join(pending)).split(SENTINEL)
+                if len(converted) != len(pending): # Shouldn't happen; be safe
+                    converted = [self._cc.convert(text) for text in pending]
+            for text, result in zip(pending, converted):
+                self._remember(text, result)
+                results[text] = result
+        return [results[text] for text in texts]
+
+    def convert_series(self, series):
+        """Converts the string values of a pandas Series; other values are kept."""
+        mask = series.map(lambda v: isinstance(v, str)).astype(bool)
+        if not mask.any():
+            return series
+        series = series.astype(object)
+        series.loc[mask] = self.convert_many(series.loc[mask].tolist())
+        return series
+
+
+def _trigger_chars():
+    """
+    Every character t2s can rewrite: changed single characters plus the
+    changed positions of phrase entries, read from the dictionary text
+    files shipped with the pure-Python OpenCC package. None if they
+    can't be found (e.g. the compiled OpenCC bindings).
+    """
+    try:
+        import opencc
+    except ImportError:
+        return None
+    base = os.path.join(os.path.dirname(opencc.__file__), 'dictionary')
+    chars = set()
+    for name in ('TSCharacters.txt', 'TSPhrases.txt'):
+        path = os.path.join(base, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, _, values = line.rstrip('\n').partition('\t')
+                for value in values.split(' '):
+                    if len(value) == len(key):
+                        chars.update(k for k, v in zip(key, value) if k != v)
+                    else:
+                        chars.update(key)
+    return frozenset(chars)
+
+
+_default = SimplifiedConverter()
+
+
+def to_simplified(text):
+    return _default.convert(text)
+
+
+def to_simplified_many(texts):
+    return _default.convert_many(texts)
+
+
+def simplify_series(series):
+    return _default.convert_series(series)
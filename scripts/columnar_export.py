@@ -0,0 +1,114 @@
+import os
+import importlib.util
+
+# pyarrow is optional: without it the summary simply skips the columnar file.
+# It is only imported when a file is actually written or read.
+COLUMNAR_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Columns stored dictionary-encoded (categorical once loaded into pandas)
+CATEGORICAL_COLUMNS = ('country_chinese', 'country_english')
+
+
+def write_columnar(rows, columns, path):
+    """
+    Writes the master table (rows of `columns`; `_id` is assigned 1..n)
+    as an uncompressed Arrow IPC/Feather v2 file, which can be
+    memory-mapped without a parse step. Returns False if pyarrow is not
+    installed.
+    """
+    if not COLUMNAR_AVAILABLE:
+        print("pyarrow not installed; skipping columnar export.")
+        return False
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    arrays = [pa.array(range(1, len(rows) + 1), type=pa.int32())]
+    for i, name in enumerate(columns):
+        array = pa.array([row[i] for row in rows], type=pa.string())
+        if name in CATEGORICAL_COLUMNS:
+            array = array.dictionary_encode()
+        arrays.append(array)
+    table = pa.Table.from_arrays(arrays, names=['_id'] + list(columns))
+
+    tmp_path = path + '.tmp'
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    return True
+
+
+class ColumnarWriter:
+    """
+    Streaming counterpart of write_columnar: appends the master table one
+    batch of rows at a time, so it never has to be held in memory. The
+    dictionary-encoded columns need their full set of values up front
+    (`categories`, {column: values}) because an Arrow file can't change a
+    dictionary between batches. With pyarrow missing every call is a no-op.
+    """
+    def __init__(self, path, columns, categories):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.columns = list(columns)
+        self.next_id = 1
+        self.writer = None
+        if not COLUMNAR_AVAILABLE:
+            print("pyarrow not installed; skipping columnar export.")
+            return
+        import pyarrow as pa
+        self.pa = pa
+        self.dictionaries = {}
+        fields = [pa.field('_id', pa.int32())]
+        for name in self.columns:
+            if name in CATEGORICAL_COLUMNS:
+                values = sorted(set(categories[name]))
+                self.dictionaries[name] = (pa.array(values, type=pa.string()),
+                                           {v: i for i, v in enumerate(values)})
+                fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                fields.append(pa.field(name, pa.string()))
+        self.schema = pa.schema(fields)
+        self.writer = pa.ipc.new_file(self.tmp_path, self.schema)
+
+    def write(self, rows):
+        if self.writer is None or not rows:
+            return
+        pa = self.pa
+        arrays = [pa.array(range(self.next_id, self.next_id + len(rows)), type=pa.int32())]
+        for i, name in enumerate(self.columns):
+            if name in self.dictionaries:
+                dictionary, index = self.dictionaries[name]
+                indices = pa.array([index[row[i]] for row in rows], type=pa.int32())
+                arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+            else:
+                arrays.append(pa.array([row[i] for row in rows], type=pa.string()))
+        self.writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+        self.next_id += len(rows)
+
+    def close(self):
+        """Finishes the file and moves it into place. Returns False without pyarrow."""
+        if self.writer is None:
+            return False
+        self.writer.close()
+        self.writer = None
+        os.replace(self.tmp_path, self.path)
+        return True
+
+    def discard(self):
+        """Abandons the file, leaving any existing one in place."""
+        if self.writer is None:
+            return
+        self.writer.close()
+        self.writer = None
+        os.remove(self.tmp_path)
+
+
+def load_columnar(path, columns=None, as_pandas=True):
+    """
+    Loads the columnar master table through a memory map. as_pandas=False
+    returns the zero-copy Arrow table; with as_pandas=True the country
+    columns come back as pandas categoricals.
+    """
+    if not COLUMNAR_AVAILABLE:
+        raise ImportError("pyarrow is required to load the columnar master table")
+    import pyarrow.feather as feather
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas() if as_pandas else table
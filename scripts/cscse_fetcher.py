@@ -0,0 +1,320 @@
+"""
+Shared client for the cscse getUniversityListOrPage endpoint.
+
+One pooled keep-alive session (scripts/ssl_adapter.get_legacy_session)
+serves every request, with retries and exponential backoff, and
+fetch_all() pulls many countries concurrently with a bounded worker count.
+Listings are paged through until exhausted and each page is decoded as
+it streams in, so memory stays flat however large a country is.
+
+Refreshes are conditional: each page's ETag/Last-Modified and a hash of
+the records are kept in cscse_refresh.json, unchanged countries are
+skipped, and changed ones only patch the rows that differ into the
+country CSV (see scripts/raw_snapshot.py).
+
+    python scripts/cscse_fetcher.py                  # refresh raw.json for every country
+    python scripts/cscse_fetcher.py UK Poland -c 4   # selected country folders
+    python scripts/cscse_fetcher.py --full           # ignore the stored validators
+"""
+import os
+import sys
+import glob
+import json
+import time
+import codecs
+import argparse
+import textwrap
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.ssl_adapter import get_legacy_session
+from scripts.countries import COUNTRY_MAP
+from scripts.json_stream import JsonArrayStream
+from scripts.raw_snapshot import RefreshState, SnapshotDiff, load_records, snapshot_names, delta_size, apply_delta
+
+CSCSE_URL = "https://yxcx.cscse.edu.cn/api/xlxwrzz/xlxwrz/getUniversityListOrPage"
+
+# Status codes worth retrying; anything else is returned as a failure straight away
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Network errors worth retrying (ChunkedEncodingError: connection dropped mid-body)
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class RetryableStatus(IOError):
+    pass
+
+# Envelope fields that may carry the total record count
+TOTAL_KEYS = ('total', 'totalCount', 'count', 'totalRecord')
+
+# items is None when the server answered 304 Not Modified
+Page = namedtuple('Page', ['items', 'total', 'validators'])
+
+
+class CscseFetcher:
+    def __init__(self, url=CSCSE_URL, concurrency=8, retries=3, backoff=0.5, timeout=30, session=None):
+        self.url = url
+        self.concurrency = max(1, int(concurrency))
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session or get_legacy_session(pool_maxsize=self.concurrency)
+        # Shared by every country and page (fetch_all and iter_country both
+        # fan out), so at most `concurrency` requests are in flight in total
+        self.slots = threading.BoundedSemaphore(self.concurrency)
+
+    def _fetch_page(self, country_name, page, page_size, validators=None):
+        """
+        Fetches one page, decoding the "data" array incrementally from the
+        response stream. Returns a Page; total is None if the API didn't
+        report one. With `validators` from an earlier response the request
+        is conditional. RETRY_STATUS responses and connection errors are
+        retried with backoff; anything else (other 4xx, a malformed body) is
+        raised at once.
+        """
+        payload = {
+            "country": country_name,
+            "currentPage": page,
+            "pageSize": page_size,
+            "universityIndex": ""
+        }
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        for attempt in range(self.retries + 1):
+            try:
+                with self.slots, self.session.post(self.url, json=payload, headers=headers,
+                                                   timeout=self.timeout, stream=True) as response:
+                    if response.status_code in RETRY_STATUS:
+                        # Read the (short) error body so the connection goes back to the pool
+                        response.content
+                        raise RetryableStatus(f"HTTP {response.status_code}")
+                    response.raise_for_status()
+                    seen = {k: v for k, v in (('etag', response.headers.get('ETag')),
+                                              ('last_modified', response.headers.get('Last-Modified'))) if v}
+                    if response.status_code == 304:
+                        return Page(None, None, seen or validators)
+                    stream = JsonArrayStream(key="data")
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                    items = []
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        items.extend(stream.feed(decoder.decode(chunk)))
+                    items.extend(stream.feed(decoder.decode(b'', final=True)))
+                    stream.close()
+                    return Page(items, _total_from(stream.metadata()), seen)
+            except (RetryableStatus,) + RETRY_ERRORS as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * (2 ** attempt)
+                print(f"Retrying {country_name} page {page} in {delay:.1f}s ({e})")
+                time.sleep(delay)
+
+    def iter_country(self, country_name, page_size=500, page_log=None):
+        """
+        Yields every record for a country, page by page, until the listing
+        is exhausted. Once the first page reports the total, the remaining
+        pages are fetched in parallel (at most `concurrency` ahead), but
+        still yielded in page order. Without a total, pages are requested
+        one after another until a short page comes back.
+
+        If `page_log` is a list, each page's validators are appended to it.
+        """
+        def emit(result):
+            if page_log is not None:
+                page_log.append(result.validators)
+            return result.items
+
+        first = self._fetch_page(country_name, 1, page_size)
+        items = emit(first)
+        yield from items
+
+        if first.total is not None:
+            pages = range(2, -(-first.total // page_size) + 1)
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                window = deque()
+                for page in pages:
+                    window.append(pool.submit(self._fetch_page, country_name, page, page_size))
+                    if len(window) >= self.concurrency:
+                        yield from emit(window.popleft().result())
+                while window:
+                    yield from emit(window.popleft().result())
+            return
+
+        page = 1
+        while len(items) == page_size:
+            page += 1
+            items = emit(self._fetch_page(country_name, page, page_size))
+            yield from items
+
+    def is_unchanged(self, country_name, pages, page_size=500):
+        """
+        Revalidates a country with conditional requests, one per page of the
+        previous fetch. True only if every page came back 304.
+        """
+        if not pages or not all(pages):
+            return False
+        for page, validators in enumerate(pages, start=1):
+            if self._fetch_page(country_name, page, page_size, validators).items is not None:
+                return False
+        return True
+
+    def fetch_country(self, country_name, page_size=500):
+        """
+        country_name: the Chinese country name the API expects (e.g. "英国").
+        returns: every record across all pages, or [] on failure.
+        """
+        try:
+            return list(self.iter_country(country_name, page_size))
+        except Exception as e:
+            print(f"Error fetching data for {country_name}: {e}")
+            return []
+
+    def fetch_all(self, country_names, page_size=500):
+        """Fetches several countries concurrently. Returns {country_name: data} in input order."""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [(name, pool.submit(self.fetch_country, name, page_size)) for name in country_names]
+            return {name: future.result() for name, future in futures}
+
+
+def _total_from(metadata):
+    """Picks the record count out of the response envelope, if it has one."""
+    if not isinstance(metadata, dict):
+        return None
+    for key in TOTAL_KEYS:
+        value = metadata.get(key)
+        if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+            return int(value)
+    return None
+
+
+def raw_record(item):
+    """API record -> the {chinese_name, english_name} layout used by data/*/raw.json."""
+    return {"chinese_name": str(item.get("CHINESE_NAME") or "").strip(),
+            "english_name": str(item.get("ENGLISH_NAME") or "").strip()}
+
+
+def record_maker(old_records):
+    """
+    raw_record for a refresh that keeps the layout of the existing raw.json:
+    files of full API records stay full, and the others keep their keys
+    (original_name instead of english_name, city, website...) with the
+    extra values of names already there.
+    """
+    first = old_records[0] if old_records else {}
+    if "CHINESE_NAME" in first:
+        return lambda item: item
+    english_key = "original_name" if "original_name" in first and "english_name" not in first else "english_name"
+    old = {}
+    for r in old_records:
+        old.setdefault(str(r.get("chinese_name") or "").strip(), r)
+
+    def make(item):
+        record = raw_record(item)
+        previous = old.get(record["chinese_name"], {})
+        made = {key: previous.get(key, "") for key in first}
+        made.update({"chinese_name": record["chinese_name"], english_key: record["english_name"]})
+        return made
+    return make
+
+
+def write_raw_json(path, records):
+    """
+    Streams records into a JSON array formatted like json.dump(..., indent=2),
+    writing a temp file and renaming it into place. Returns the record count.
+    """
+    count = 0
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write('[\n' if count == 0 else ',\n')
+                f.write(textwrap.indent(json.dumps(record, ensure_ascii=False, indent=2), '  '))
+                count += 1
+            f.write('\n]' if count else '[]')
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    if count:
+        os.replace(tmp_path, path)
+    else:
+        os.remove(tmp_path)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh data/<Country>/raw.json from cscse.")
+    parser.add_argument('countries', nargs='*', help="country folder names (default: all except China)")
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('--url', default=CSCSE_URL)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--state', default=os.path.join(ROOT, 'cscse_refresh.json'),
+                        help="where page validators and snapshot hashes are kept")
+    parser.add_argument('--full', action='store_true', help="refetch everything, ignoring stored validators")
+    args = parser.parse_args()
+
+    folders = args.countries or [c for c in COUNTRY_MAP if c != 'China']
+    fetcher = CscseFetcher(url=args.url, concurrency=args.concurrency)
+    state = RefreshState(args.state)
+    page_size = args.page_size
+
+    def refresh(folder):
+        country_dir = os.path.join(ROOT, 'data', folder)
+        raw_path = os.path.join(country_dir, 'raw.json')
+        entry = None if args.full else state.get(folder)
+        try:
+            if entry and entry['page_size'] == page_size and \
+                    fetcher.is_unchanged(COUNTRY_MAP[folder], entry['pages'], page_size):
+                return 'unchanged'
+            # Records are hashed and diffed against the old raw.json as they
+            # stream into a new file, which only replaces it if they changed
+            pages = []
+            old_records = load_records(raw_path)
+            snapshot = SnapshotDiff(snapshot_names(old_records))
+            make_record = record_maker(old_records)
+            records = (make_record(item) for item in fetcher.iter_country(COUNTRY_MAP[folder], page_size, pages))
+            os.makedirs(country_dir, exist_ok=True)
+            new_path = raw_path + '.new'
+            count = write_raw_json(new_path, snapshot.watch(records))
+        except Exception as e:
+            print(f"{folder}: error fetching data ({e}), keeping existing raw.json")
+            return 'failed'
+        if not count:
+            print(f"{folder}: no data, keeping existing raw.json")
+            return 'failed'
+
+        digest = snapshot.digest()
+        if entry and entry['sha1'] == digest and os.path.exists(raw_path):
+            os.remove(new_path)
+            state.update(folder, pages, page_size, digest, count)
+            return 'unchanged'
+
+        delta = snapshot.delta()
+        os.replace(new_path, raw_path)
+        if delta_size(delta):
+            existing = glob.glob(os.path.join(country_dir, '*_universities.csv'))
+            csv_path = existing[0] if existing else \
+                os.path.join(country_dir, f"{folder.lower().replace(' ', '_')}_universities.csv")
+            apply_delta(csv_path, delta)
+        state.update(folder, pages, page_size, digest, count)
+        print(f"{folder}: {count} universities "
+              f"(+{len(delta['added'])} ~{len(delta['changed'])} -{len(delta['removed'])})")
+        return 'changed' if delta_size(delta) else 'unchanged'
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=fetcher.concurrency) as pool:
+        outcomes = list(pool.map(refresh, folders))
+    state.save()
+    print(f"Checked {len(folders)} countries in {time.perf_counter() - start:.1f}s: "
+          f"{outcomes.count('changed')} changed, {outcomes.count('unchanged')} unchanged, "
+          f"{outcomes.count('failed')} failed")
+
+
+if __name__ == "__main__":
+    main()
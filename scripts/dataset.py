@@ -0,0 +1,101 @@
+import os
+import io
+
+_pandas = None
+
+
+def import_pandas():
+    """
+    Imports pandas on first use. Stages hand each other shallow copies of
+    the country frames; copy-on-write (the default from pandas 3 on) keeps
+    those copies cheap and isolated.
+    """
+    global _pandas
+    if _pandas is None:
+        import pandas as pd
+        if int(pd.__version__.split('.')[0]) < 3:
+            pd.set_option('mode.copy_on_write', True)
+        _pandas = pd
+    return _pandas
+
+
+class CountryFile:
+    """
+    One CSV under data/<country>/. The bytes and the parsed DataFrame are
+    loaded lazily on first access, and the file is only written back by
+    flush() if a stage replaced or marked the frame dirty.
+    """
+    def __init__(self, data_root, country, name):
+        self.country = country
+        self.name = name
+        self.key = f"{country}/{name}"
+        self.path = os.path.join(data_root, country, name)
+        self.dirty = False
+        self._raw = None
+        self._df = None
+
+    @property
+    def raw(self):
+        if self._raw is None:
+            with open(self.path, 'rb') as f:
+                self._raw = f.read()
+        return self._raw
+
+    @property
+    def loaded(self):
+        return self._df is not None
+
+    @property
+    def df(self):
+        if self._df is None:
+            self._df = import_pandas().read_csv(io.BytesIO(self.raw), encoding='utf-8-sig')
+        return self._df
+
+    @df.setter
+    def df(self, value):
+        self._df = value
+        self.dirty = True
+
+    def flush(self):
+        if not self.dirty:
+            return False
+        data = self._df.to_csv(index=False).encode('utf-8-sig')
+        with open(self.path, 'wb') as f:
+            f.write(data)
+        self._raw = data
+        self.dirty = False
+        return True
+
+
+class Dataset:
+    """
+    All country CSVs under data/, read at most once and shared by the
+    normalize, translate and summarize stages.
+    """
+    def __init__(self, data_root):
+        self.data_root = data_root
+        self.files = []
+        for country in sorted(os.listdir(data_root)):
+            country_path = os.path.join(data_root, country)
+            if not os.path.isdir(country_path) or country.startswith('.'):
+                continue
+            for name in sorted(os.listdir(country_path)):
+                if name.endswith('.csv'):
+                    self.files.append(CountryFile(data_root, country, name))
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def select(self, suffix='_universities.csv'):
+        return [cf for cf in self.files if cf.name.endswith(suffix)]
+
+    def flush(self):
+        """Writes every dirty file once. Returns the keys that were written."""
+        written = []
+        for cf in self.files:
+            try:
+                if cf.flush():
+                    written.append(cf.key)
+            except Exception as e:
+                print(f"Error writing {cf.path}: {e}")
+        return written
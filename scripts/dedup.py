@@ -0,0 +1,275 @@
+"""
+Duplicate detection over the master table: the same institution listed
+under two countries, or twice with near-identical names.
+
+Comparing every pair of rows is quadratic, so rows are first grouped by
+blocking keys: the distinctive tokens of the folded English name (generic
+words like "university" left out) and the bigrams of the simplified
+Chinese name. Only rows sharing a key become candidate pairs, and each
+row only looks at its `probe` rarest keys, skipping blocks larger than
+`max_block` (a key that common says nothing about identity). Candidate
+pairs are scored by the Dice coefficient of the name grams and the
+matches are joined into clusters (union-find).
+
+Many different institutions share a name, so a similar name is not
+enough on its own. Bracketed notes (（佛罗里达州）, （俄亥俄州）) tell
+homonyms apart and must be the same on both rows. A direction
+(北/东北, Northern/Northeastern) must not be the only difference, and
+names that both add words, in Chinese and in English, name a branch
+(福冈国际医疗福祉大学 / "... Welfare Fukuoka") rather than the same school. Rows
+from different countries need one of the names to mention the other
+row's country, since "Southeast University" in China and in Bangladesh
+are two universities.
+
+    python scripts/dedup.py --csv world_universities.csv --output duplicates.csv
+"""
+import os
+import sys
+import re
+import csv
+import argparse
+from collections import defaultdict
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.text_normalize import normalize, to_simplified, fold_english
+from scripts.fuzzy_index import english_grams
+
+# Words too common in institution names to say which institution it is
+GENERIC_WORDS = {
+    'of', 'the', 'and', 'for', 'de', 'del', 'la', 'di', 'da', 'do', 'des', 'du', 'in', 'at', 'y', 'e', 'et', 'und',
+    'university', 'universidad', 'universidade', 'universite', 'universita', 'universitat', 'universiteit',
+    'college', 'institute', 'institut', 'instituto', 'school', 'academy', 'national', 'state', 'technology',
+    'science', 'sciences', 'polytechnic', 'technical', 'technological', 'vocational', 'campus', 'center',
+    'centre', 'federal',
+}
+NOTES = re.compile(r'[（(][^（）()]*[）)]')
+# Qualifiers that make a similar name another institution (北伊利诺伊 / 东北伊利诺伊)
+DIRECTION_CHARS = set('东南西北')
+DIRECTION_WORDS = {
+    'north', 'south', 'east', 'west', 'northern', 'southern', 'eastern', 'western', 'northeast', 'northwest',
+    'southeast', 'southwest', 'northeastern', 'northwestern', 'southeastern', 'southwestern', 'upper', 'lower',
+}
+# Spellings folded together before comparing
+ABBREVIATIONS = {'st': 'saint', 'univ': 'university', 'inst': 'institute'}
+
+
+def english_keys(name):
+    """Distinctive words of the folded English name, in order."""
+    if not name:
+        return []
+    words = []
+    for t in fold_english(name).split():
+        t = ABBREVIATIONS.get(t, t)
+        if len(t) > 1 and t not in GENERIC_WORDS:
+            words.append(t)
+    return words
+
+
+def english_key_grams(name):
+    """
+    Trigrams of the distinctive words only, so "Liaocheng Vocational
+    College" and "Baicheng Vocational College" don't look alike just
+    for sharing their generic part. Names made only of generic words
+    fall back to the whole name.
+    """
+    words = english_keys(name)
+    return english_grams(' '.join(words)) if words else english_grams(name)
+
+
+def chinese_key(name):
+    """Simplified, normalized Chinese name without bracketed notes (（校区）, （法语）)."""
+    if not name:
+        return ''
+    name = to_simplified(str(name))
+    return normalize(NOTES.sub('', name)) or normalize(name)
+
+
+def chinese_notes(name):
+    """The bracketed notes of a Chinese name, normalized (（波多黎各） -> {'波多黎各'})."""
+    if not name:
+        return frozenset()
+    return frozenset(normalize(note) for note in NOTES.findall(to_simplified(str(name))))
+
+
+def qualifier_conflict(zh_a, zh_b, words_a, words_b):
+    """
+    True if the two names differ by a direction in either language, or
+    differ in both languages (one adds a place or campus to the other).
+    """
+    words = set(words_a) ^ set(words_b)
+    if DIRECTION_CHARS & (set(zh_a) ^ set(zh_b)) or DIRECTION_WORDS & words:
+        return True
+    return bool(zh_a and zh_b and zh_a != zh_b and words_a and words_b and words)
+
+
+def mentions_country(row, country_chinese, country_english):
+    """True if the row's name names the given country ("...of Ukraine", "乌克兰...")."""
+    if country_chinese and country_chinese in str(row[0] or ''):
+        return True
+    country = fold_english(country_english or '')
+    return bool(country) and f" {country} " in f" {fold_english(row[1] or '')} "
+
+
+def bigrams(key):
+    if len(key) < 2:
+        return {key} if key else set()
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+def dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def chinese_similarity(a, b):
+    """
+    Bigram Dice of two Chinese keys, but 0 unless one key's characters are
+    all in the other: duplicates gain a prefix or a bracketed note, while
+    a swapped character (常州 / 沧州) is almost always another place.
+    """
+    ca, cb = set(a), set(b)
+    if not (ca <= cb or cb <= ca):
+        return 0.0
+    return dice(bigrams(a), bigrams(b))
+
+
+class DuplicateDetector:
+    """
+    Finds clusters of duplicate rows among summary rows
+    ([chinese_name, english_name, country_chinese, country_english]).
+    A pair matches when its score reaches `threshold`: the lower of the
+    Chinese and English name similarities, or just the one available when
+    a name is missing on either side. It also has to pass same_institution:
+    equal bracketed notes, no differing direction and, across countries,
+    a name that mentions the other row's country.
+    """
+    def __init__(self, threshold=0.85, max_block=50, probe=3):
+        self.threshold = threshold
+        self.max_block = max_block
+        self.probe = probe
+
+    def _keys(self, rows):
+        """Per row: (chinese key, {blocking keys})."""
+        chinese = []
+        keys = []
+        for row in rows:
+            zh = chinese_key(row[0])
+            chinese.append(zh)
+            # Chinese bigrams and (ASCII) English words can't collide in practice,
+            # and a collision would only add a pair to score
+            row_keys = bigrams(zh)
+            row_keys.update(english_keys(row[1]))
+            keys.append(row_keys)
+        return chinese, keys
+
+    def candidate_pairs(self, rows, keys=None):
+        """Set of (i, j) row positions, i < j, sharing a usable blocking key."""
+        if keys is None:
+            keys = self._keys(rows)[1]
+        postings = defaultdict(list)
+        for pos, row_keys in enumerate(keys):
+            for k in row_keys:
+                postings[k].append(pos)
+
+        usable = {k: block for k, block in postings.items() if 1 < len(block) <= self.max_block}
+
+        pairs = set()
+        for pos, row_keys in enumerate(keys):
+            blocks = [usable[k] for k in row_keys if k in usable]
+            if not blocks:
+                continue
+            blocks.sort(key=len)
+            for block in blocks[:self.probe]:
+                pairs.update((pos, other) for other in block if other > pos)
+        return pairs
+
+    def same_institution(self, a, b, zh_a, zh_b):
+        """The checks besides name similarity, for rows `a` and `b` with Chinese keys zh_a, zh_b."""
+        if chinese_notes(a[0]) != chinese_notes(b[0]):
+            return False
+        if qualifier_conflict(zh_a, zh_b, english_keys(a[1]), english_keys(b[1])):
+            return False
+        if len(a) < 4 or len(b) < 4 or (a[2], a[3]) == (b[2], b[3]):
+            return True
+        return mentions_country(a, b[2], b[3]) or mentions_country(b, a[2], a[3])
+
+    def clusters(self, rows):
+        """Lists of row positions (two or more, ascending), ordered by their first row."""
+        chinese, keys = self._keys(rows)
+        en_grams = {}
+
+        def english(pos):
+            grams = en_grams.get(pos)
+            if grams is None:
+                grams = en_grams[pos] = english_key_grams(rows[pos][1]) if rows[pos][1] else set()
+            return grams
+
+        parent = list(range(len(rows)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i, j in self.candidate_pairs(rows, keys):
+            zh_i, zh_j = chinese[i], chinese[j]
+            if len(rows[i]) >= 4 and len(rows[j]) >= 4 and rows[i][2] != rows[j][2]:
+                # A re-listing under another country names its home country
+                # ("日本..." listed under France); compare the names without it
+                zh_i = zh_i.replace(normalize(rows[j][2] or ''), '') or zh_i
+                zh_j = zh_j.replace(normalize(rows[i][2] or ''), '') or zh_j
+            scores = []
+            if zh_i and zh_j:
+                scores.append(chinese_similarity(zh_i, zh_j))
+            a, b = english(i), english(j)
+            if a and b:
+                scores.append(dice(a, b))
+            if scores and min(scores) >= self.threshold and self.same_institution(rows[i], rows[j], zh_i, zh_j):
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+        # Roots are the smallest position of their cluster, so visiting
+        # positions in order fills each cluster in ascending order
+        groups = {}
+        for pos in range(len(rows)):
+            root = find(pos)
+            if root != pos:
+                groups.setdefault(root, [root]).append(pos)
+        return sorted(groups.values(), key=lambda g: g[0])
+
+
+def merge_duplicates(rows, clusters):
+    """Keeps the first row of each cluster and drops the rest, preserving order."""
+    drop = {pos for cluster in clusters for pos in cluster[1:]}
+    return [row for pos, row in enumerate(rows) if pos not in drop]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report clusters of duplicate rows in world_universities.csv.")
+    parser.add_argument('--csv', default='world_universities.csv')
+    parser.add_argument('--output', default=None, help="write the clusters to this CSV instead of printing them")
+    parser.add_argument('--threshold', type=float, default=0.85)
+    args = parser.parse_args()
+
+    with open(args.csv, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row[1:5] for row in reader]
+
+    clusters = DuplicateDetector(threshold=args.threshold).clusters(rows)
+    print(f"{len(clusters)} clusters covering {sum(len(c) for c in clusters)} of {len(rows)} rows")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['cluster'] + header)
+            for n, cluster in enumerate(clusters, 1):
+                writer.writerows([n, pos + 1] + rows[pos] for pos in cluster)
+    else:
+        for cluster in clusters:
+            print(' | '.join(f"{rows[pos][0]} / {rows[pos][1]} ({rows[pos][3]})" for pos in cluster))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import re
+import pandas as pd
+
+# Terms that clearly indicate the name is NOT fully English
+BAD_KEYWORDS = [
+    # Spanish / Portuguese / Italian
+    'universidad', 'facultad', 'escuela', 'politécnica', 'autónoma',
+    'universidade', 'instituto', 'superior', 'nacional', 'católica', 'pontificia',
+    'degli', 'studi', 'accademia', 'politecnico',
+    # French (unaccented versions as ASCII check handled accented ones)
+    'universite', 'ecole', 'superieur', 'superieure', 'francais',
+    'academie', 'conservatoire', 'royale',
+    # German / Dutch / Northern Europe
+    'universitat', 'hochschule', 'fachhochschule', 'akademie', 'hogeschool',
+    'vrije', 'uniwersytet', 'politechnika', 'univerzita', 'vysoka', 'skola', 'egyetem'
+]
+
+
+class EnglishNameValidator:
+    """
+    Decides whether a university name is already acceptable English.
+
+    All keywords are compiled once into a single alternation that only
+    matches whole words (not preceded/followed by [a-z0-9]), so a name is
+    checked with one regex search instead of one per keyword.
+    """
+    def __init__(self, keywords=BAD_KEYWORDS):
+        alternation = '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+        self.pattern = r'(?<![a-z0-9])(?:' + alternation + r')(?![a-z0-9])'
+        self.regex = re.compile(self.pattern)
+
+    def is_valid(self, text):
+        if pd.isna(text) or str(text).strip() == "" or str(text).lower() == "nan":
+            return False
+        text_str = str(text)
+
+        # Most "International English" names should be ASCII. If it contains
+        # accents (é, à, etc.) or non-latin scripts, it needs translation.
+        if not text_str.isascii():
+            return False
+
+        # Even if it is pure ASCII (e.g. "Universidad"), it might not be English.
+        return self.regex.search(text_str.lower()) is None
+
+    def validate_series(self, series):
+        """Vectorized is_valid(): returns a boolean Series aligned with `series`."""
+        missing = series.isna()
+        text = series.astype(object).where(~missing, '').astype(str)
+        lowered = text.str.lower()
+
+        invalid = (
+            missing
+            | (text.str.strip() == '')
+            | (lowered == 'nan')
+            | text.str.contains(r'[^\x00-\x7f]', regex=True)
+            | lowered.str.contains(self.pattern, regex=True)
+        )
+        return ~invalid
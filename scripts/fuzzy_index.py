@@ -0,0 +1,93 @@
+import re
+import heapq
+from collections import Counter
+
+from scripts.text_normalize import normalize, to_simplified, fold_english
+
+CJK = re.compile(r'[㐀-鿿]')
+
+
+def chinese_grams(name):
+    """Character bigrams of the simplified, normalized name (unigram for 1-char names)."""
+    key = normalize(to_simplified(str(name)))
+    if len(key) < 2:
+        return {key} if key else set()
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+def english_grams(name):
+    """Word-padded character trigrams of the folded English name."""
+    key = fold_english(name)
+    if not key:
+        return set()
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _GramIndex:
+    """
+    Inverted index from n-gram to record positions, scored by the Dice
+    coefficient of the gram sets. Candidates come from at most `probe` of
+    the rarest query grams, so very common grams ("uni", "大学") don't
+    force a scan of most of the table; a typo only spoils a few grams.
+    """
+    def __init__(self, gram_sets, probe=6, max_candidates=200, common_fraction=0.05):
+        self.gram_sets = gram_sets
+        self.postings = {}
+        for pos, grams in enumerate(gram_sets):
+            for g in grams:
+                self.postings.setdefault(g, []).append(pos)
+        self.probe = probe
+        self.max_candidates = max_candidates
+        self.common_limit = max(50, int(len(gram_sets) * common_fraction))
+
+    def search(self, query_grams, k):
+        if not query_grams:
+            return []
+        counts = Counter()
+        for n, g in enumerate(sorted(query_grams, key=lambda g: len(self.postings.get(g, ())))):
+            posting = self.postings.get(g)
+            if not posting:
+                continue
+            if counts and (n >= self.probe or len(posting) > self.common_limit):
+                break
+            counts.update(posting)
+
+        scored = []
+        q_len = len(query_grams)
+        for pos, _ in counts.most_common(self.max_candidates):
+            grams = self.gram_sets[pos]
+            scored.append((2 * len(query_grams & grams) / (q_len + len(grams)), pos))
+        return heapq.nlargest(k, scored)
+
+
+class FuzzyUniversityIndex:
+    """
+    Typo-tolerant search over the master table: character-bigram index for
+    Chinese names (Traditional input is converted to Simplified first) and
+    trigram index for English names (accent- and case-insensitive).
+    """
+    def __init__(self, records):
+        self.records = records
+        self.chinese = _GramIndex([chinese_grams(r['chinese_name']) for r in records])
+        self.english = _GramIndex([english_grams(r['english_name']) for r in records])
+
+    @classmethod
+    def from_csv(cls, path):
+        from scripts.university_index import UniversityIndex
+        return cls(UniversityIndex.from_csv(path).records)
+
+    def _results(self, hits):
+        return [dict(self.records[pos], score=round(score, 4)) for score, pos in hits]
+
+    def search_chinese(self, query, k=5):
+        return self._results(self.chinese.search(chinese_grams(query), k))
+
+    def search_english(self, query, k=5):
+        return self._results(self.english.search(english_grams(query), k))
+
+    def search(self, query, k=5):
+        """Routes to the Chinese index if the query contains CJK characters."""
+        if CJK.search(str(query)):
+            return self.search_chinese(query, k)
+        return self.search_english(query, k)
@@ -0,0 +1,93 @@
+import re
+import json
+
+
+class JsonArrayStream:
+    """
+    Incrementally decodes the items of one JSON array as text arrives, so
+    a large response never has to be held (or parsed) as a whole.
+
+    key=None follows the first top-level array; key="data" follows the
+    array stored under "data" in the top-level object. Whatever surrounds
+    the array is kept (it is small) and available from metadata() once
+    the stream is complete.
+    """
+    def __init__(self, key=None):
+        self.key = key
+        self.decoder = json.JSONDecoder()
+        self.buf = ''
+        self.state = 'prefix'
+        self.prefix = ''
+        self.suffix = []
+        if key is None:
+            self.start = re.compile(r'\[')
+        else:
+            self.start = re.compile(r'"' + re.escape(key) + r'"\s*:\s*\[')
+
+    @property
+    def done(self):
+        return self.state == 'suffix'
+
+    def feed(self, text):
+        """Adds a chunk of text; returns the list of items it completed."""
+        if self.state == 'suffix':
+            self.suffix.append(text)
+            return []
+        self.buf += text
+        if self.state == 'prefix':
+            match = self.start.search(self.buf)
+            if not match:
+                return []
+            self.prefix = self.buf[:match.end() - 1]
+            self.buf = self.buf[match.end():]
+            self.state = 'items'
+        return self._drain()
+
+    def _drain(self):
+        items = []
+        buf = self.buf
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buf):
+                break
+            if buf[pos] == ']':
+                self.state = 'suffix'
+                self.suffix.append(buf[pos + 1:])
+                buf, pos = '', 0
+                break
+            try:
+                item, end = self.decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break # Item not complete yet
+            if isinstance(item, (int, float)) and not isinstance(item, bool):
+                rest = buf[end:].lstrip(' \t\r\n')
+                if not rest or rest[0] not in ',]':
+                    break # A number may still be growing ("2." -> "2.5")
+            items.append(item)
+            pos = end
+        self.buf = buf[pos:]
+        return items
+
+    def close(self):
+        """Call at end of input; raises ValueError if the array never closed."""
+        if self.state != 'suffix':
+            raise ValueError("JSON array was not complete")
+
+    def metadata(self):
+        """The enclosing document with the array emptied, e.g. {"total": 120, "data": []}."""
+        if self.state != 'suffix':
+            return None
+        try:
+            return json.loads(self.prefix + '[]' + ''.join(self.suffix))
+        except ValueError:
+            return None
+
+
+def iter_json_array(chunks, key=None):
+    """Yields array items from an iterable of text chunks."""
+    stream = JsonArrayStream(key)
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    stream.close()
@@ -0,0 +1,69 @@
+"""
+Write-back table for the scripts that fill in missing English names.
+
+The row positions of every `chinese_name` are collected into a dict
+once; each translated batch then looks up only its own keys and is
+applied with one vectorized assignment, and the count of names still missing is kept up to date
+from the rows that batch touched. A batch costs time proportional to its
+size instead of to the table, so the per-name `df.loc[df[col] == name]`
+scans and the per-batch re-count of the whole column go away.
+"""
+import numpy as np
+
+
+def is_missing(values):
+    """Boolean array: empty, whitespace-only, "nan" or NaN/None values."""
+    missing = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if not isinstance(value, str):
+            missing[i] = True
+        else:
+            value = value.strip()
+            missing[i] = not value or value.lower() == 'nan'
+    return missing
+
+
+class MissingNameTable:
+    def __init__(self, df, key='chinese_name', value='english_name'):
+        self.df = df
+        self.value = value
+        self.keys = df[key].to_numpy(dtype=object)
+        # A name can be listed more than once: {key: [row positions]}
+        self.positions = {}
+        for i, k in enumerate(self.keys):
+            self.positions.setdefault(k, []).append(i)
+        self.values = df[value].to_numpy(dtype=object, copy=True)
+        self.missing_mask = is_missing(self.values)
+        self.missing = int(self.missing_mask.sum())
+
+    def missing_keys(self):
+        """Keys of the rows still missing a value, in table order (no duplicates)."""
+        return list(dict.fromkeys(self.keys[self.missing_mask]))
+
+    def update(self, results):
+        """
+        Sets `value` on every row whose key is in `results` ({key: value}).
+        Returns the number of rows that stopped being missing.
+        """
+        if not results:
+            return 0
+        positions = []
+        new_values = []
+        for k, v in results.items():
+            rows = self.positions.get(k, ())
+            positions.extend(rows)
+            new_values.extend([v] * len(rows))
+        if not positions:
+            return 0
+        positions = np.array(positions, dtype=np.intp)
+        new_values = np.array(new_values, dtype=object)
+        filled = int(self.missing_mask[positions].sum())
+        self.values[positions] = new_values
+        self.missing_mask[positions] = False
+        self.missing -= filled
+        return filled
+
+    def frame(self):
+        """The DataFrame with every update applied (for saving)."""
+        self.df[self.value] = self.values
+        return self.df
@@ -0,0 +1,200 @@
+import os
+import csv
+import json
+import hashlib
+
+from scripts.text_normalize import clean_name
+
+
+class RefreshState:
+    """
+    Remembers, per country folder, the HTTP validators (ETag/Last-Modified)
+    of every listing page and a hash of the records last written to
+    raw.json, so a refresh can ask the API "has this changed?" and skip
+    countries that haven't.
+    """
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.countries = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable refresh state {self.path}: {e}")
+            return
+        if data.get('version') == self.VERSION:
+            self.countries = data.get('countries', {})
+
+    def get(self, folder):
+        return self.countries.get(folder)
+
+    def update(self, folder, pages, page_size, digest, count):
+        self.countries[folder] = {'pages': pages, 'page_size': page_size, 'sha1': digest, 'count': count}
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'countries': self.countries},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def snapshot_names(records):
+    """
+    {chinese_name: english_name} for any raw.json layout (API records,
+    english_name or original_name). The first entry wins for repeated
+    names, as in normalization.
+    """
+    names = {}
+    for r in records:
+        chinese = str(r.get('chinese_name') or r.get('CHINESE_NAME') or '').strip()
+        if not chinese or chinese in names:
+            continue
+        english = r.get('english_name') or r.get('original_name') or r.get('ENGLISH_NAME') or ''
+        names[chinese] = str(english).strip()
+    return names
+
+
+def load_records(path):
+    """Records of an existing raw.json, or [] if there is none."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable snapshot {path}: {e}")
+        return []
+
+
+def snapshot_digest(records):
+    return hashlib.sha1(json.dumps(records, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def diff_snapshots(old, new):
+    """
+    Row-level diff of two {chinese_name: english_name} snapshots.
+    Returns {'added': {...}, 'changed': {...}, 'removed': [...]}.
+    """
+    added = {c: e for c, e in new.items() if c not in old}
+    changed = {c: e for c, e in new.items() if c in old and old[c] != e}
+    removed = [c for c in old if c not in new]
+    return {'added': added, 'changed': changed, 'removed': removed}
+
+
+class SnapshotDiff:
+    """
+    Incremental snapshot_digest and diff_snapshots for records as they
+    stream past (wrap the iterator with watch()), so a refresh never holds
+    a whole listing: only the old {chinese_name: english_name} snapshot,
+    the names seen so far and the delta are kept.
+    """
+    def __init__(self, old):
+        self.old = old
+        self.sha1 = hashlib.sha1()
+        self.count = 0
+        self.seen = set()
+        self.added = {}
+        self.changed = {}
+
+    def watch(self, records):
+        for record in records:
+            self.add(record)
+            yield record
+
+    def add(self, record):
+        # Same bytes as json.dumps(records) in snapshot_digest
+        self.sha1.update((', ' if self.count else '[').encode('utf-8'))
+        self.sha1.update(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+        self.count += 1
+        # First entry wins for repeated names, as in snapshot_names
+        chinese, english = next(iter(snapshot_names([record]).items()), (None, None))
+        if chinese is None or chinese in self.seen:
+            return
+        self.seen.add(chinese)
+        if chinese not in self.old:
+            self.added[chinese] = english
+        elif self.old[chinese] != english:
+            self.changed[chinese] = english
+
+    def digest(self):
+        sha1 = self.sha1.copy()
+        sha1.update(b']' if self.count else b'[]')
+        return sha1.hexdigest()
+
+    def delta(self):
+        removed = [c for c in self.old if c not in self.seen]
+        return {'added': self.added, 'changed': self.changed, 'removed': removed}
+
+
+def delta_size(delta):
+    return len(delta['added']) + len(delta['changed']) + len(delta['removed'])
+
+
+def apply_delta(csv_path, delta):
+    """
+    Patches a country CSV in place with a snapshot diff: changed names get
+    the new English name, removed ones are dropped and new ones appended.
+    New English names are cleaned with clean_name, as the CSVs are. Untouched rows (including earlier translations) are kept as they are.
+    Creates the file if it doesn't exist yet.
+    """
+    header = ['chinese_name', 'english_name']
+    rows = []
+    if os.path.exists(csv_path):
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, header)
+            rows = list(reader)
+
+    columns = [str(c).strip().lower().replace(' ', '_') for c in header]
+    if 'chinese_name' not in columns:
+        print(f"Skipping {csv_path}: Missing 'chinese_name'. Found: {header}")
+        return False
+    c_idx = columns.index('chinese_name')
+    if 'english_name' in columns:
+        e_idx = columns.index('english_name')
+    elif 'original_name' in columns:
+        e_idx = columns.index('original_name')
+    else:
+        header.append('english_name')
+        e_idx = len(header) - 1
+
+    removed = set(delta['removed'])
+    patched = []
+    for row in rows:
+        row = row + [''] * (len(header) - len(row))
+        chinese = row[c_idx].strip()
+        if chinese in removed:
+            continue
+        if chinese in delta['changed']:
+            row[e_idx] = clean_name(delta['changed'][chinese])
+        patched.append(row)
+
+    present = {row[c_idx].strip() for row in patched}
+    for chinese, english in delta['added'].items():
+        if chinese in present:
+            continue
+        row = [''] * len(header)
+        row[c_idx] = chinese
+        row[e_idx] = clean_name(english)
+        patched.append(row)
+
+    tmp_path = csv_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(patched)
+    os.replace(tmp_path, csv_path)
+    return True
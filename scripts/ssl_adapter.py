@@ -12,7 +12,8 @@ class CustomHttpAdapter(requests.adapters.HTTPAdapter):
             num_pools=connections, maxsize=maxsize,
             block=block, ssl_context=ctx)
 
-def get_legacy_session():
+def get_legacy_session(pool_maxsize=10):
     session = requests.Session()
-    session.mount('https://', CustomHttpAdapter())
+    session.mount('https://', CustomHttpAdapter(pool_maxsize=pool_maxsize))
+    session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize))
     return session
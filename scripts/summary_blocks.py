@@ -0,0 +1,84 @@
+import io
+from scripts.summary_manifest import SummaryManifest
+from scripts.dataset import import_pandas
+from scripts.chinese_convert import simplify_series
+
+# Column layout of world_universities.csv (after the leading _id)
+SUMMARY_COLUMNS = ['chinese_name', 'english_name', 'country_chinese', 'country_english']
+
+# Files under data/China/ that are tagged as their own region:
+# (file name markers, country_english, country_chinese)
+CHINA_REGIONS = [
+    (('hk_universities.csv', 'hong_kong'), 'Hong Kong', '中国香港'),
+    (('macau_universities.csv', 'macao'), 'Macau', '中国澳门'),
+    (('taiwan_universities.csv', 'taiwan'), 'Taiwan', '中国台湾'),
+]
+
+
+def clean_quotes(s):
+    s = s.strip()
+    if len(s) >= 2 and s.startswith('"') and s.endswith('"'):
+        s = s[1:-1].strip()
+    return s.replace('"', "'")
+
+
+def country_labels(country, country_chinese, file):
+    """(country_english, country_chinese) a file's rows are tagged with."""
+    if country == 'China':
+        for markers, region_english, region_chinese in CHINA_REGIONS:
+            if markers[0] in file or markers[1] in file.lower():
+                return region_english, region_chinese
+    return country, country_chinese
+
+
+def summary_block(df, country, country_chinese, file):
+    """
+    Turns one country frame into the cleaned
+    [chinese_name, english_name, country_chinese, country_english] rows
+    it contributes to the master table. Returns [] for files without
+    the required columns. Does not modify `df`.
+    """
+    df = df.copy(deep=False)
+    # Normalize internal columns just in case
+    df.columns = [str(c).strip().lower().replace(' ', '_') for c in df.columns]
+
+    if 'chinese_name' not in df.columns or 'english_name' not in df.columns:
+        return [] # Skipping verbose invalid files
+
+    # Master table names are always Simplified
+    df['chinese_name'] = simplify_series(df['chinese_name'])
+
+    # Clean English Name
+    df['english_name'] = df['english_name'].astype(str).str.replace(',', ' ', regex=False)
+    df['english_name'] = df['english_name'].apply(clean_quotes)
+
+    # Add country columns (China regions get their own)
+    df['country_english'], df['country_chinese'] = country_labels(country, country_chinese, file)
+
+    block = df[SUMMARY_COLUMNS].astype(object)
+    return block.where(block.notna(), None).values.tolist()
+
+
+def load_summary_block(path, country, country_chinese, file):
+    """
+    Process-pool worker: reads one CSV from disk and returns
+    (content digest, summary rows). Pure apart from the file read.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    df = import_pandas().read_csv(io.BytesIO(raw), encoding='utf-8-sig')
+    return SummaryManifest.file_digest(raw), summary_block(df, country, country_chinese, file)
+
+
+def iter_summary_chunks(path, country, country_chinese, file, chunksize):
+    """
+    Streaming counterpart of load_summary_block: reads the CSV `chunksize`
+    rows at a time and yields each chunk's summary rows, so memory is
+    bounded by the chunk rather than the file.
+    """
+    reader = import_pandas().read_csv(path, encoding='utf-8-sig', chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            rows = summary_block(chunk, country, country_chinese, file)
+            if rows:
+                yield rows
@@ -0,0 +1,100 @@
+import os
+import json
+import hashlib
+
+
+class SummaryManifest:
+    """
+    Remembers, per country CSV, the size/mtime/content hash it had and the
+    cleaned row block it contributed to world_universities.csv, so a rebuild
+    only has to re-parse the files that actually changed.
+    """
+    VERSION = 2
+
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        self.output = None
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable manifest {self.path}: {e}")
+            return
+        if data.get('version') != self.VERSION:
+            return
+        self.files = data.get('files', {})
+        self.output = data.get('output')
+
+    def clear(self):
+        self.files = {}
+        self.output = None
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'files': self.files, 'output': self.output},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    @staticmethod
+    def file_digest(data):
+        return hashlib.sha1(data).hexdigest()
+
+    def is_fresh(self, key, st):
+        """Cheap check: same size and mtime as when the block was recorded."""
+        entry = self.files.get(key)
+        return entry is not None and entry['size'] == st.st_size and entry['mtime'] == st.st_mtime_ns
+
+    def matches_digest(self, key, st, digest):
+        """
+        The file was touched but its content is unchanged; refresh the stat
+        info so the next run takes the cheap path again.
+        """
+        entry = self.files.get(key)
+        if entry is None or entry['sha1'] != digest:
+            return False
+        entry['size'] = st.st_size
+        entry['mtime'] = st.st_mtime_ns
+        self.dirty = True
+        return True
+
+    def update(self, key, st, digest, rows):
+        self.files[key] = {'size': st.st_size, 'mtime': st.st_mtime_ns, 'sha1': digest, 'rows': rows}
+        self.dirty = True
+
+    def rows(self, key):
+        return self.files[key]['rows']
+
+    def prune(self, keys):
+        """Drop entries for files that no longer exist. Returns True if any were removed."""
+        stale = [k for k in self.files if k not in keys]
+        for k in stale:
+            del self.files[k]
+        if stale:
+            self.dirty = True
+        return bool(stale)
+
+    def output_matches(self, output_file, options=None):
+        """The output is the one recorded, built with the same `options` (e.g. dedupe)."""
+        if self.output is None or not os.path.exists(output_file):
+            return False
+        if self.output.get('options') != options:
+            return False
+        st = os.stat(output_file)
+        return self.output['size'] == st.st_size and self.output['mtime'] == st.st_mtime_ns
+
+    def record_output(self, output_file, options=None):
+        st = os.stat(output_file)
+        self.output = {'size': st.st_size, 'mtime': st.st_mtime_ns, 'options': options}
+        self.dirty = True
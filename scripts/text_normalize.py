@@ -0,0 +1,27 @@
+import re
+import unicodedata
+
+from scripts.chinese_convert import to_simplified
+
+
+def normalize(name):
+    # Matching key for Chinese names (the data/China scrapers, fuzzy index and dedup): drop whitespace and brackets
+    return re.sub(r'[\s\(\)（）]', '', name)
+
+
+def fold_english(name):
+    """Lowercase ASCII key for English names: accents stripped, punctuation collapsed."""
+    text = str(name)
+    # Most names are plain ASCII already; NFKD is the identity on those
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+
+def clean_name(ename):
+    # English name as written to the CSVs: wrapping quotes dropped, inner quotes and commas replaced
+    ename = str(ename).strip()
+    if ename.startswith('"') and ename.endswith('"'):
+        ename = ename[1:-1].strip()
+    return ename.replace('"', "'").replace(',', ' ')
@@ -0,0 +1,282 @@
+"""
+Translation backends. A backend turns a batch of
+{'chinese_name', 'original_name'} entries into
+{'chinese_name', 'english_name'} items and describes itself with
+Capabilities; it may leave out entries it can't handle.
+
+RuleBasedBackend is local and deterministic: it folds accents off names
+that are English already and rewrites the one common shape of
+Romance institution names it can translate safely ("Universidad
+Nacional de X" -> "National University of X"). It only answers when the
+result passes the English name check, so whatever it isn't sure about
+is left for a remote backend (GeminiTranslator). TieredTranslator chains the two: only the residue of
+the local backend is sent out.
+"""
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+Capabilities = namedtuple('Capabilities', ['max_batch', 'concurrency', 'streaming', 'remote'])
+
+
+class TranslationBackend(ABC):
+    """
+    Base class of translation engines (RuleBasedBackend here,
+    main.GeminiTranslator). `max_batch` caps entries per call
+    (None: no cap), `concurrency` is how many calls may run at once,
+    `streaming` says whether stream_batch yields items as they arrive,
+    `remote` whether calls leave the machine.
+    """
+    name = 'backend'
+    capabilities = Capabilities(max_batch=None, concurrency=1, streaming=False, remote=False)
+
+    @abstractmethod
+    def translate_batch(self, universities, country, language=None):
+        """Returns the items it could translate; entries left out weren't handled."""
+
+    def stream_batch(self, universities, country, language=None):
+        yield from self.translate_batch(universities, country, language)
+
+
+# Folded (lowercase, unaccented) institution nouns -> English
+TERMS = {
+    'universidad': 'University', 'universidade': 'University', 'universita': 'University',
+    'universite': 'University', 'universitat': 'University', 'universiteit': 'University',
+    'universitatea': 'University', 'instituto': 'Institute', 'institut': 'Institute', 'istituto': 'Institute',
+    'escuela': 'School', 'escola': 'School', 'ecole': 'School', 'scuola': 'School', 'facultad': 'Faculty',
+    'faculdade': 'Faculty', 'faculte': 'Faculty', 'academia': 'Academy', 'accademia': 'Academy',
+    'academie': 'Academy', 'akademie': 'Academy', 'colegio': 'College', 'centro': 'Center',
+    'politecnico': 'Polytechnic', 'hochschule': 'University of Applied Sciences',
+    'fachhochschule': 'University of Applied Sciences', 'conservatorio': 'Conservatory',
+    'conservatoire': 'Conservatory', 'seminario': 'Seminary', 'hogeschool': 'University of Applied Sciences',
+}
+# The nouns rule_translate rewrites: "Universidad de X" is nearly always a
+# place or a person, while schools and institutes go on with a subject
+# ("Escuela Superior de Guerra")
+RULE_NOUNS = {k for k, v in TERMS.items() if v == 'University'}
+# Folded adjectives that go before the noun in English
+ADJECTIVES = {
+    'nacional': 'National', 'nazionale': 'National', 'nationale': 'National', 'statale': 'State', 'autonoma': 'Autonomous', 'autonomo': 'Autonomous',
+    'catolica': 'Catholic', 'catolico': 'Catholic', 'cattolica': 'Catholic', 'catholique': 'Catholic',
+    'katholische': 'Catholic', 'pontificia': 'Pontifical', 'pontificio': 'Pontifical',
+    'tecnologica': 'Technological', 'tecnologico': 'Technological', 'tecnica': 'Technical',
+    'tecnico': 'Technical', 'technische': 'Technical', 'politecnica': 'Polytechnic',
+    'superior': 'Higher', 'superiore': 'Higher', 'superieure': 'Higher', 'superieur': 'Higher',
+    'federal': 'Federal', 'estadual': 'State', 'estatal': 'State', 'publica': 'Public', 'privada': 'Private',
+    'libre': 'Free', 'libera': 'Free', 'vrije': 'Free', 'freie': 'Free', 'pedagogica': 'Pedagogical',
+    'pedagogico': 'Pedagogical', 'internacional': 'International', 'internazionale': 'International',
+    'internationale': 'International',
+    'europea': 'European', 'europeo': 'European', 'americana': 'American', 'metropolitana': 'Metropolitan',
+    'abierta': 'Open', 'aberta': 'Open', 'militar': 'Military',
+    'real': 'Royal', 'royale': 'Royal', 'regional': 'Regional', 'central': 'Central', 'popular': 'Popular',
+    'evangelica': 'Evangelical', 'adventista': 'Adventist', 'bautista': 'Baptist', 'medica': 'Medical',
+    'agraria': 'Agrarian', 'agricola': 'Agricultural', 'veterinaria': 'Veterinary', 'nova': 'New',
+    'nueva': 'New', 'nuova': 'New',
+}
+# Folded connectors -> English (None: dropped)
+CONNECTORS = {
+    'de': 'of', 'del': 'of', 'do': 'of', 'da': 'of', 'dos': 'of', 'das': 'of', 'di': 'of', 'della': 'of',
+    'dello': 'of', 'dei': 'of', 'degli': 'of', 'delle': 'of', 'des': 'of', 'du': 'of', 'der': 'of',
+    'y': 'and', 'e': 'and', 'et': 'and', 'und': 'and', 'en': 'in', 'em': 'in', 'a': 'in', 'para': 'for',
+    'la': None, 'el': None, 'los': None, 'las': None, 'le': None, 'les': None, 'il': None, 'lo': None,
+}
+ENGLISH_WORDS = {'of', 'and', 'the', 'in', 'for', 'at', 'on', '&'}
+# Connectors without an article; only these introduce the place name
+PLAIN_CONNECTORS = {'de', 'di', "d'"}
+# English words that mark a name as (partly) English already ("Royal
+# Conservatoire of Scotland", "Institut Mines-Télécom Business School");
+# such names are only accent-folded, never rewritten
+ENGLISH_NAME_WORDS = ENGLISH_WORDS | {
+    'university', 'college', 'institute', 'school', 'academy', 'conservatory', 'polytechnic', 'center',
+    'centre', 'faculty', 'business', 'management', 'music', 'art', 'arts', 'science', 'sciences', 'technology',
+    'engineering', 'medicine', 'medical', 'law', 'design', 'studies', 'education', 'seminary', 'campus',
+}
+# Folded common nouns that look like proper names when capitalized but
+# need a real translation ("Institut d'Études Politiques"); names with
+# one of these are left for the remote backend
+FOREIGN_NOUNS = {
+    'etudes', 'estudios', 'estudos', 'studi', 'politiques', 'politicas', 'ciencias', 'ciencia',
+    'scienze', 'sciences', 'wissenschaften', 'ingenieria', 'engenharia', 'ingegneria', 'medicina', 'derecho',
+    'direito', 'economia', 'economicas', 'artes', 'arte', 'arts', 'bellas', 'belas', 'beaux', 'musique',
+    'musica', 'musik', 'tecnologia', 'saude', 'salud', 'educacion', 'educacao', 'ensino', 'ensenanza',
+    'formacion', 'commerce', 'gestion', 'administracion', 'negocios', 'ponts', 'chaussees', 'mines',
+    'arquitectura', 'republica', 'teologia', 'filosofia', 'letras', 'lettres', 'humanidades', 'comercio',
+    'agronomia', 'enfermeria', 'odontologia', 'psicologia', 'deporte', 'deportes', 'turismo', 'idiomas',
+    'especialidades',
+}
+# Filler dropped before translating: "Università degli Studi di Milano"
+FILLER = re.compile(r'\b(?:degli|delle) studi\b', re.IGNORECASE)
+ELISION = re.compile(r"^([ldLD])['’](.+)$")
+EDGES = re.compile(r'^(\W*)(.*?)(\W*)$')
+
+
+# Letters NFKD doesn't decompose into a base letter and an accent
+LETTERS = str.maketrans({'ł': 'l', 'Ł': 'L', 'ø': 'o', 'Ø': 'O', 'đ': 'd', 'Đ': 'D', 'ß': 'ss',
+                         'æ': 'ae', 'Æ': 'Ae', 'œ': 'oe', 'Œ': 'Oe', 'ı': 'i'})
+
+
+def fold(text):
+    text = unicodedata.normalize('NFKD', text.translate(LETTERS))
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def _is_proper(word):
+    return word[:1].isupper() or any(c.isdigit() for c in word)
+
+
+def _tokens(name):
+    """Words with elided articles split off: "l'Université" -> "l'", "Université"."""
+    for word in FILLER.sub(' ', name).split():
+        match = ELISION.match(word)
+        if match:
+            yield match.group(1).lower() + "'"
+            yield match.group(2)
+        else:
+            yield word
+
+
+def has_english_words(name):
+    return any(fold(EDGES.match(word).group(2)).lower() in ENGLISH_NAME_WORDS for word in _tokens(name))
+
+
+def has_foreign_terms(name):
+    """True if the name contains a word the rules translate (a term, adjective or connector)."""
+    for word in _tokens(name):
+        key = fold(EDGES.match(word).group(2)).lower()
+        if word in ("l'", "d'") or key in TERMS:
+            return True
+        if key in ADJECTIVES and ADJECTIVES[key].lower() != key:
+            # "Federal", "Central" are English too
+            return True
+        if key in CONNECTORS and key not in ENGLISH_WORDS and not word[:1].isupper():
+            return True
+    return False
+
+
+def rule_translate(name):
+    """
+    English name for `name`, or None unless it has exactly the shape
+    [article] adjectives* noun adjectives* de|di|d' Place, with a
+    university noun (RULE_NOUNS), known adjectives and a place made of
+    proper words
+    ("Universidad Nacional Autónoma de México" -> "National Autonomous
+    University of Mexico", "Universidade Federal do..." is left alone).
+    Anything else, such as a noun followed straight by a name ("École
+    Polytechnique", "Universität Hamburg"), an articled connector ("del
+    Lusso" may be a common noun) or an unknown word before the
+    connector, is left for a real translator.
+    """
+    words = list(_tokens(name))
+    i = 0
+    first = fold(words[0]).lower() if words else ''
+    if first == "l'" or CONNECTORS.get(first, '') is None:
+        i = 1 # leading article: "La Universidad ...", "L'Université ..."
+    before, noun, after = [], None, []
+    for i in range(i, len(words)):
+        key = fold(EDGES.match(words[i]).group(2)).lower()
+        if noun is None and key in RULE_NOUNS:
+            noun = TERMS[key]
+        elif key in ADJECTIVES:
+            (before if noun is None else after).append(ADJECTIVES[key])
+        else:
+            break
+    else:
+        return None
+    if noun is None or fold(words[i]).lower() not in PLAIN_CONNECTORS:
+        return None
+
+    place = words[i + 1:]
+    if not place or not _is_proper(place[0]) or not _is_proper(place[-1]):
+        return None
+    for word in place:
+        key = fold(EDGES.match(word).group(2)).lower()
+        if key in FOREIGN_NOUNS or key in TERMS or key in ADJECTIVES or key in ENGLISH_WORDS:
+            return None
+        # Lowercase words only as the "de" inside a place name ("Rio de Janeiro")
+        if not _is_proper(word) and key not in PLAIN_CONNECTORS:
+            return None
+    return fold(' '.join(before + after + [noun, 'of'] + place))
+
+
+class RuleBasedBackend(TranslationBackend):
+    name = 'rules'
+    capabilities = Capabilities(max_batch=None, concurrency=1, streaming=False, remote=False)
+
+    def __init__(self, validator=None):
+        if validator is None:
+            from scripts.english_validator import EnglishNameValidator
+            validator = EnglishNameValidator()
+        self.validator = validator
+
+    def translate_name(self, name):
+        """English name for `name`, or None if it should go to a real translator."""
+        if not isinstance(name, str) or not name.strip():
+            return None
+        name = ' '.join(name.split())
+        if has_english_words(name) or not has_foreign_terms(name):
+            # English apart from accents ("University of Tübingen"); a name
+            # that mixes in foreign terms fails the check and goes remote
+            folded = fold(name)
+            return folded if self.validator.is_valid(folded) else None
+        result = rule_translate(name)
+        if result and self.validator.is_valid(result):
+            return result
+        return None
+
+    def translate_batch(self, universities, country, language=None):
+        results = []
+        for uni in universities:
+            english = self.translate_name(uni.get('original_name'))
+            if english:
+                results.append({'chinese_name': uni['chinese_name'], 'english_name': english})
+        return results
+
+
+class TieredTranslator:
+    """
+    Offers the translate_university_names / stream_university_names
+    interface of GeminiTranslator on top of a local backend and an
+    optional remote one: each batch goes to the local backend first and
+    only the entries it left out are sent to the remote backend (split
+    to its max_batch). Without a remote backend the residue stays
+    untranslated.
+    """
+    def __init__(self, local, remote=None):
+        self.local = local
+        self.remote = remote
+        self.local_count = 0
+        self.remote_count = 0
+
+    @property
+    def capabilities(self):
+        return (self.remote or self.local).capabilities
+
+    def split(self, universities, country, language=None):
+        """Returns (items the local backend translated, entries it left for the remote one)."""
+        results = self.local.translate_batch(universities, country, language)
+        done = {item['chinese_name'] for item in results}
+        rest = [uni for uni in universities if uni['chinese_name'] not in done]
+        self.local_count += len(results)
+        return results, rest
+
+    def _remote_batches(self, rest):
+        size = self.remote.capabilities.max_batch or len(rest)
+        return [rest[i:i + size] for i in range(0, len(rest), size)]
+
+    def translate_university_names(self, universities, country="Poland", language=None):
+        results, rest = self.split(universities, country, language)
+        if rest and self.remote is not None:
+            for batch in self._remote_batches(rest):
+                remote = self.remote.translate_batch(batch, country, language)
+                self.remote_count += len(batch)
+                results.extend(remote)
+        return results
+
+    def stream_university_names(self, universities, country="Poland", language=None):
+        results, rest = self.split(universities, country, language)
+        yield from results
+        if rest and self.remote is not None:
+            for batch in self._remote_batches(rest):
+                self.remote_count += len(batch)
+                yield from self.remote.stream_batch(batch, country, language)
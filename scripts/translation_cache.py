@@ -0,0 +1,54 @@
+import os
+import json
+import threading
+
+# Returned by TranslationCache.get() when nothing is recorded for a key.
+# A recorded negative result is stored (and returned) as None.
+MISSING = object()
+
+
+class TranslationCache:
+    """
+    Append-only JSONL store of translation results with an in-memory index.
+
+    Keys are (prompt_version, country, language, chinese_name, original_name),
+    so changing the prompt text naturally invalidates older entries. Each
+    line is {"key": [...], "english_name": str or null}; later lines win.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self.entries[tuple(record['key'])] = record['english_name']
+                except (ValueError, KeyError, TypeError):
+                    # A torn last line from an interrupted run; skip it
+                    continue
+
+    @staticmethod
+    def key(prompt_version, country, language, chinese_name, original_name):
+        return (prompt_version, str(country), str(language or ''), str(chinese_name), str(original_name))
+
+    def get(self, key):
+        return self.entries.get(key, MISSING)
+
+    def put_many(self, items):
+        """items: iterable of (key, english_name or None)."""
+        lines = []
+        with self.lock:
+            for key, english_name in items:
+                if self.entries.get(key, MISSING) == english_name:
+                    continue
+                self.entries[key] = english_name
+                lines.append(json.dumps({'key': list(key), 'english_name': english_name}, ensure_ascii=False))
+            if lines:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
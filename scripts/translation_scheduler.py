@@ -0,0 +1,70 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenBucket:
+    """
+    Simple thread-safe token bucket: `rate` tokens per second, holding at
+    most `capacity` tokens. acquire() blocks until a token is available.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranslationScheduler:
+    """
+    Keeps up to `concurrency` translation batches in flight at once, across
+    all countries, optionally throttled by a token bucket of
+    `requests_per_second`. The translator only needs a
+    translate_university_names(batch, country=..., language=...) method.
+    """
+    def __init__(self, translator, concurrency=4, requests_per_second=None, burst=None):
+        self.translator = translator
+        self.concurrency = max(1, int(concurrency))
+        self.bucket = TokenBucket(requests_per_second, burst) if requests_per_second else None
+
+    def _call(self, batch, country, language):
+        if self.bucket:
+            self.bucket.acquire()
+        try:
+            return self.translator.translate_university_names(batch, country=country, language=language)
+        except Exception as e:
+            print(f"Error translating batch for {country}: {e}")
+            return []
+
+    def run(self, jobs):
+        """
+        jobs: list of (key, batch, country, language) tuples.
+        returns: {key: [result items...]} with each key's results concatenated
+        in job submission order, regardless of completion order.
+        """
+        results = {}
+        if not jobs:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(jobs))) as pool:
+            futures = [
+                (key, pool.submit(self._call, batch, country, language))
+                for key, batch, country, language in jobs
+            ]
+            for key, future in futures:
+                results.setdefault(key, []).extend(future.result())
+
+        return results
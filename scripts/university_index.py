@@ -0,0 +1,57 @@
+import csv
+
+from scripts.text_normalize import fold_english
+
+FIELDS = ['_id', 'chinese_name', 'english_name', 'country_chinese', 'country_english']
+
+
+class UniversityIndex:
+    """
+    In-memory index over world_universities.csv with O(1) exact lookups.
+
+    Name lookups return lists, since the same name can appear under more
+    than one country; get() returns a single record or None.
+    """
+    def __init__(self, records):
+        self.records = records
+        self.by_id = {}
+        self.by_chinese = {}
+        self.by_english = {}
+        self.by_country = {}
+        for record in records:
+            self.by_id[record['_id']] = record
+            self.by_chinese.setdefault(record['chinese_name'], []).append(record)
+            self.by_english.setdefault(fold_english(record['english_name']), []).append(record)
+            # Countries can be listed by either their English or Chinese name
+            self.by_country.setdefault(record['country_english'].lower(), []).append(record)
+            if record['country_chinese'] != record['country_english']:
+                self.by_country.setdefault(record['country_chinese'], []).append(record)
+
+    @classmethod
+    def from_csv(cls, path):
+        records = []
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                record = {field: row.get(field, '') for field in FIELDS}
+                record['_id'] = int(record['_id'])
+                records.append(record)
+        return cls(records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, _id):
+        return self.by_id.get(int(_id))
+
+    def lookup_chinese(self, name):
+        return self.by_chinese.get(str(name).strip(), [])
+
+    def lookup_english(self, name):
+        return self.by_english.get(fold_english(name), [])
+
+    def list_country(self, country):
+        country = str(country).strip()
+        return self.by_country.get(country.lower()) or self.by_country.get(country, [])
+
+    def countries(self):
+        return sorted({r['country_english'] for r in self.records})
@@ -0,0 +1,108 @@
+"""
+Small read-only HTTP API over UniversityIndex (stdlib only).
+
+    python scripts/university_server.py --port 8000
+
+    GET /universities/<_id>
+    GET /lookup?chinese=北京大学
+    GET /lookup?english=peking university
+    GET /countries
+    GET /countries/<country_english or country_chinese>
+    GET /search?q=Universite de Paris&k=5      (typo-tolerant, scored)
+"""
+import os
+import sys
+import json
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.university_index import UniversityIndex
+from scripts.fuzzy_index import FuzzyUniversityIndex
+
+
+class UniversityRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive so clients can reuse connections; headers and body go out as
+    # separate writes, so Nagle would otherwise add ~40 ms per response
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    index = None
+    fuzzy = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+        query = parse_qs(url.query)
+
+        if len(parts) == 2 and parts[0] == 'universities':
+            try:
+                record = self.index.get(parts[1])
+            except ValueError:
+                record = None
+            if record is None:
+                return self._send(404, {'error': 'not found'})
+            return self._send(200, record)
+
+        if parts == ['lookup']:
+            if 'chinese' in query:
+                return self._send(200, self.index.lookup_chinese(query['chinese'][0]))
+            if 'english' in query:
+                return self._send(200, self.index.lookup_english(query['english'][0]))
+            return self._send(400, {'error': "expected 'chinese' or 'english' query parameter"})
+
+        if parts == ['search'] and self.fuzzy is not None:
+            if 'q' not in query:
+                return self._send(400, {'error': "expected 'q' query parameter"})
+            try:
+                k = min(50, int(query.get('k', ['5'])[0]))
+            except ValueError:
+                return self._send(400, {'error': "'k' must be an integer"})
+            return self._send(200, self.fuzzy.search(query['q'][0], k=k))
+
+        if parts == ['countries']:
+            return self._send(200, self.index.countries())
+
+        if len(parts) == 2 and parts[0] == 'countries':
+            return self._send(200, self.index.list_country(parts[1]))
+
+        return self._send(404, {'error': 'not found'})
+
+
+def make_server(index, host='127.0.0.1', port=8000, fuzzy=None):
+    handler = type('BoundUniversityRequestHandler', (UniversityRequestHandler,), {'index': index, 'fuzzy': fuzzy})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'world_universities.csv'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    index = UniversityIndex.from_csv(args.csv)
+    server = make_server(index, args.host, args.port, fuzzy=FuzzyUniversityIndex(index.records))
+    print(f"Serving {len(index)} universities on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
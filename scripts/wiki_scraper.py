@@ -0,0 +1,203 @@
+"""
+Shared fetcher for the Wikipedia scrapers under data/China/.
+
+Pages are kept in an on-disk cache keyed by URL and revision id. Before
+fetching, one batched MediaWiki API query asks for the current revision
+of every page, so a re-run downloads only pages that were edited since
+(and nothing at all if none were). Misses are fetched concurrently over
+one pooled session, throttled by a token bucket to stay polite.
+
+Offline runs (offline=True) never touch the network: pages come from
+`fixtures_dir` (saved HTML named after the page title, e.g.
+List_of_universities_and_colleges_in_Macau.html) or the newest cached copy.
+"""
+import os
+import re
+import sys
+import hashlib
+import threading
+from urllib.parse import unquote, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from scripts.translation_scheduler import TokenBucket
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_CACHE_DIR = os.path.join(ROOT, '.wiki_cache')
+
+REVISION_ID = re.compile(r'"wgRevisionId"\s*:\s*(\d+)')
+
+# The MediaWiki API accepts at most 50 titles per query
+TITLES_PER_QUERY = 50
+
+
+def page_title(url):
+    """https://en.wikipedia.org/wiki/Foo_bar -> 'Foo_bar'"""
+    path = urlsplit(url).path
+    return unquote(path.split('/wiki/', 1)[-1])
+
+
+class WikiScraper:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, concurrency=4, requests_per_second=2,
+                 timeout=30, offline=False, fixtures_dir=None, session=None):
+        self.cache_dir = cache_dir
+        self.concurrency = max(1, int(concurrency))
+        self.bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        self.timeout = timeout
+        self.offline = offline
+        self.fixtures_dir = fixtures_dir
+        self._session = session
+        self._session_lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(cache_dir=args.cache_dir, concurrency=args.concurrency,
+                   offline=args.offline, fixtures_dir=args.fixtures)
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                self._session = requests.Session()
+                self._session.headers['User-Agent'] = USER_AGENT
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.concurrency)
+                self._session.mount('https://', adapter)
+                self._session.mount('http://', adapter)
+            return self._session
+
+    def _get(self, url, **kwargs):
+        if self.bucket:
+            self.bucket.acquire()
+        response = self.session.get(url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    # Cache layout: <cache_dir>/<sha1(url)>/<revision>.html
+
+    def _url_dir(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def _cached(self, url, revision=None):
+        """Path of the cached copy at `revision`, or the newest one if None."""
+        url_dir = self._url_dir(url)
+        if revision is not None:
+            path = os.path.join(url_dir, f"{revision}.html")
+            return path if os.path.exists(path) else None
+        if not os.path.isdir(url_dir):
+            return None
+        pages = [os.path.join(url_dir, name) for name in os.listdir(url_dir) if name.endswith('.html')]
+        return max(pages, key=os.path.getmtime) if pages else None
+
+    def _store(self, url, html):
+        match = REVISION_ID.search(html)
+        url_dir = self._url_dir(url)
+        os.makedirs(url_dir, exist_ok=True)
+        path = os.path.join(url_dir, f"{match.group(1) if match else 'latest'}.html")
+        tmp_path = path + f".{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+
+    def _fixture(self, url):
+        if not self.fixtures_dir:
+            return None
+        path = os.path.join(self.fixtures_dir, page_title(url) + '.html')
+        return path if os.path.exists(path) else None
+
+    def revisions(self, urls):
+        """
+        Current revision id per URL, from batched API queries. URLs the API
+        couldn't resolve (or all of them, if it is unreachable) are missing.
+        """
+        by_host = {}
+        for url in urls:
+            parts = urlsplit(url)
+            by_host.setdefault(f"{parts.scheme}://{parts.netloc}", []).append(url)
+
+        revisions = {}
+        for host, host_urls in by_host.items():
+            for i in range(0, len(host_urls), TITLES_PER_QUERY):
+                chunk = host_urls[i:i + TITLES_PER_QUERY]
+                try:
+                    data = self._get(f"{host}/w/api.php", params={
+                        'action': 'query', 'prop': 'revisions', 'rvprop': 'ids', 'redirects': 1,
+                        'format': 'json', 'formatversion': 2,
+                        'titles': '|'.join(page_title(u) for u in chunk),
+                    }).json()
+                except Exception as e:
+                    print(f"Could not check revisions on {host}: {e}")
+                    continue
+                query = data.get('query', {})
+                aliases = {}
+                for entry in query.get('normalized', []) + query.get('redirects', []):
+                    aliases[entry['from']] = entry['to']
+                current = {}
+                for page in query.get('pages', []):
+                    if page.get('revisions'):
+                        current[page['title']] = page['revisions'][0]['revid']
+                for url in chunk:
+                    title = page_title(url)
+                    while title in aliases and title not in current:
+                        title = aliases.pop(title)
+                    if title in current:
+                        revisions[url] = current[title]
+        return revisions
+
+    def fetch_many(self, urls):
+        """
+        Returns {url: html} in input order; pages that could not be fetched
+        (or found, when offline) map to None.
+        """
+        pages = {}
+        missing = []
+        revisions = {} if self.offline else self.revisions(urls)
+        for url in urls:
+            path = self._fixture(url) if self.offline else None
+            if path is None:
+                revision = revisions.get(url)
+                # Without a known revision a cached copy is used as is
+                path = self._cached(url, revision) or (self._cached(url) if revision is None else None)
+            if path:
+                with open(path, 'r', encoding='utf-8') as f:
+                    pages[url] = f.read()
+            elif self.offline:
+                print(f"Offline: no fixture or cached copy of {url}")
+                pages[url] = None
+            else:
+                missing.append(url)
+
+        def download(url):
+            try:
+                html = self._get(url).text
+            except Exception as e:
+                print(f"Failed to fetch {url}: {e}")
+                return None
+            self._store(url, html)
+            return html
+
+        if missing:
+            print(f"Fetching {len(missing)} of {len(urls)} pages ({len(urls) - len(missing)} cached)...")
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for url, html in zip(missing, pool.map(download, missing)):
+                    pages[url] = html
+        return {url: pages[url] for url in urls}
+
+    def fetch(self, url):
+        return self.fetch_many([url])[url]
+
+    def scrape(self, urls, extractor):
+        """
+        Fetches every URL and runs `extractor(html)` on each page.
+        Returns {url: extracted rows}; pages that couldn't be fetched give [].
+        """
+        return {url: (extractor(html) if html else []) for url, html in self.fetch_many(urls).items()}
+
+
+def add_scraper_arguments(parser):
+    parser.add_argument('--offline', action='store_true', help="use fixtures/cached pages only")
+    parser.add_argument('--fixtures', help="directory of saved <Page_title>.html files")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('-c', '--concurrency', type=int, default=4)
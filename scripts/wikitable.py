@@ -0,0 +1,125 @@
+"""
+Shared wikitable extraction for the Wikipedia scrapers, on lxml's C
+parser. Cells spanning several rows or columns (rowspan/colspan) are
+repeated into every position they cover, so row[i] always lines up with
+header[i]; footnote markers (<sup class="reference">) are dropped.
+"""
+import re
+from collections import namedtuple
+
+import lxml.html
+
+NameRow = namedtuple('NameRow', ['english_name', 'chinese_name'])
+
+TABLES = '//table[contains(concat(" ", normalize-space(@class), " "), " wikitable ")]'
+REFERENCES = './/sup[contains(concat(" ", normalize-space(@class), " "), " reference ")]'
+ROWS = './tr | ./thead/tr | ./tbody/tr | ./tfoot/tr'
+SPACES = re.compile(r'\s+')
+PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+
+class Table:
+    def __init__(self, rows):
+        self.header = rows[0] if rows else []
+        self.rows = rows[1:]
+
+    def column(self, *tests, last=False):
+        """Index of the first (or last) header cell (lower-cased) passing any test, or -1."""
+        found = -1
+        for i, h in enumerate(self.header):
+            h = h.lower()
+            if any(test(h) for test in tests):
+                if not last:
+                    return i
+                found = i
+        return found
+
+    def name_columns(self, last_english=False):
+        """
+        (english_idx, chinese_idx) by the usual header wording: the last
+        header mentioning "chinese" is the Chinese name, the first other
+        one mentioning "name" (or "school"/"institution") the English name,
+        or the last one with `last_english` ("Name" ... "Former name"
+        picks "Former name", as the Taiwan scraper always has).
+        """
+        chi_idx = self.column(lambda h: 'chinese' in h, last=True)
+        eng_idx = self.column(lambda h: 'chinese' not in h and ('name' in h or h in ('school', 'institution')),
+                              last=last_english)
+        return eng_idx, chi_idx
+
+
+def _span(cell, attr):
+    try:
+        return max(1, int(cell.get(attr, 1)))
+    except ValueError:
+        return 1
+
+
+def _cell_text(cell):
+    return SPACES.sub(' ', cell.text_content()).strip()
+
+
+def _expand(table):
+    """Rows of cell text with rowspan/colspan filled in."""
+    rows = []
+    pending = {} # column -> [rows remaining, text]
+    for tr in table.xpath(ROWS):
+        row = []
+        col = 0
+        cells = tr.iterchildren('td', 'th')
+        cell = next(cells, None)
+        while cell is not None or any(c >= col for c in pending):
+            if col in pending:
+                remaining, text = pending[col]
+                row.append(text)
+                if remaining == 1:
+                    del pending[col]
+                else:
+                    pending[col][0] -= 1
+                col += 1
+                continue
+            if cell is None:
+                row.append('')
+                col += 1
+                continue
+            text = _cell_text(cell)
+            rowspan = _span(cell, 'rowspan')
+            for _ in range(_span(cell, 'colspan')):
+                if rowspan > 1:
+                    pending[col] = [rowspan - 1, text]
+                row.append(text)
+                col += 1
+            cell = next(cells, None)
+        if row:
+            rows.append(row)
+    return rows
+
+
+def iter_tables(html):
+    """Yields a Table for every wikitable on the page, in document order."""
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    doc = lxml.html.fromstring(html, parser=PARSER)
+    for table in doc.xpath(TABLES):
+        for sup in table.xpath(REFERENCES):
+            sup.drop_tree()
+        yield Table(_expand(table))
+
+
+def iter_name_rows(html, english=None, chinese=None, last_english=False):
+    """
+    Yields NameRow(english_name, chinese_name) from every wikitable whose
+    name columns can be found (see Table.name_columns). Pass column
+    indexes to skip header detection.
+    """
+    for table in iter_tables(html):
+        eng_idx, chi_idx = table.name_columns(last_english)
+        if english is not None:
+            eng_idx = english
+        if chinese is not None:
+            chi_idx = chinese
+        if eng_idx == -1 or chi_idx == -1:
+            continue
+        for row in table.rows:
+            if len(row) > max(eng_idx, chi_idx):
+                yield NameRow(row[eng_idx], row[chi_idx])